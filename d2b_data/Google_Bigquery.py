@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas
+from google.cloud import bigquery
 from google.oauth2 import service_account
 from tqdm import tqdm
 
@@ -79,11 +82,47 @@ class Google_Bigquery():
     date = date.replace("ñ","n")
     return date
 
-  def upload(self,dataframe,date_column,destination,project_id,clean=True,if_exists="replace"):
+  UPLOAD_MODES = ("sharded", "single_job", "partitions")
+  WRITE_DISPOSITIONS = {
+      "replace": bigquery.WriteDisposition.WRITE_TRUNCATE,
+      "append": bigquery.WriteDisposition.WRITE_APPEND,
+      "fail": bigquery.WriteDisposition.WRITE_EMPTY,
+  }
+
+  def upload(self,dataframe,date_column,destination,project_id,clean=True,if_exists="replace",mode="sharded",max_workers=8):
+      """
+      Sube un dataframe a BigQuery separado por fecha
+      ARGS:
+      dataframe: <DataFrame> datos a subir,
+      date_column: <str> columna con la fecha (YYYY-MM-DD),
+      destination: <str> "sharded": prefijo de las tablas (dataset.tabla_ -> dataset.tabla_YYYYMMDD);
+                   "single_job" / "partitions": tabla particionada por día (dataset.tabla),
+      project_id: <str> project_id,
+      clean: <bool> normaliza los nombres de columnas,
+      if_exists: <str> "replace", "append" o "fail",
+      mode: <str> "sharded": un to_gbq por fecha (comportamiento original);
+            "single_job": un solo load job a la tabla particionada por date_column
+            (con if_exists="replace" se reemplaza la tabla completa);
+            "partitions": un load job por día a tabla$YYYYMMDD en paralelo
+            (con if_exists="replace" solo se reemplazan los días subidos),
+      max_workers: <int> load jobs simultáneos en modo "partitions"
+      """
+      if mode not in self.UPLOAD_MODES:
+          raise ValueError(f"mode must be one of {self.UPLOAD_MODES}")
+
       if clean:
-          print("cleaning")
+          if mode == "sharded":
+              print("cleaning")
+          else:
+              self.debug("cleaning")
           dataframe = self.dataframe_clean_cols(dataframe)
           date_column = self.clean_date(date_column)
+
+      if mode == "single_job":
+          return self._upload_single_job(dataframe,date_column,destination,project_id,if_exists)
+      if mode == "partitions":
+          return self._upload_partitions(dataframe,date_column,destination,project_id,if_exists,max_workers)
+
       dataframe[date_column] = dataframe[date_column].astype(str)
 
       unique_dates = dataframe[date_column].unique()
@@ -104,3 +143,80 @@ class Google_Bigquery():
                          progress_bar=False
       )
       return
+
+  def _upload_single_job(self,dataframe,date_column,destination,project_id,if_exists):
+      """
+      Sube todo el dataframe con un solo load job a una tabla particionada por día
+      """
+      client = self._get_client(project_id)
+      dataframe = self._with_date_column(dataframe,date_column)
+
+      self.debug('uploading {rows} rows to {table} in one load job...'.format(rows=len(dataframe),table=destination))
+      job = client.load_table_from_dataframe(
+          dataframe,
+          self._table_id(destination,project_id),
+          job_config=self._partitioned_job_config(date_column,if_exists),
+      )
+      job.result()
+      return
+
+  def _upload_partitions(self,dataframe,date_column,destination,project_id,if_exists,max_workers=8):
+      """
+      Sube cada día a su partición (tabla$YYYYMMDD) con load jobs en paralelo, como máximo max_workers a la vez.
+      El primer día se sube solo: si la tabla no existe ese job la crea y los demás no compiten por crearla
+      """
+      client = self._get_client(project_id)
+      dataframe = self._with_date_column(dataframe,date_column)
+      table_id = self._table_id(destination,project_id)
+      job_config = self._partitioned_job_config(date_column,if_exists)
+
+      def load_partition(date):
+          self.debug('uploading {date} data to BigQuery...'.format(date=date))
+          partition_df = dataframe[dataframe[date_column]==date]
+          job = client.load_table_from_dataframe(
+              partition_df,
+              table_id+"$"+date.strftime("%Y%m%d"),
+              job_config=job_config,
+          )
+          job.result()
+          return date
+
+      unique_dates = sorted(dataframe[date_column].unique())
+      if not unique_dates:
+          return
+
+      load_partition(unique_dates[0])
+
+      with ThreadPoolExecutor(max_workers=max(1,max_workers)) as executor:
+          loaded = executor.map(load_partition,unique_dates[1:])
+          if self.verbose:
+              loaded = tqdm(loaded, total=len(unique_dates)-1, desc='Uploading partitions')
+          for _ in loaded:
+              pass
+      return
+
+  def _get_client(self,project_id):
+      return bigquery.Client(project=project_id,credentials=self.credentials)
+
+  def _table_id(self,destination,project_id):
+      # dataset.tabla -> proyecto.dataset.tabla
+      if destination.count(".") == 1:
+          return project_id+"."+destination
+      return destination
+
+  def _with_date_column(self,dataframe,date_column):
+      # La columna de partición debe llegar como DATE
+      dataframe = dataframe.copy()
+      dataframe[date_column] = pandas.to_datetime(dataframe[date_column]).dt.date
+      return dataframe
+
+  def _partitioned_job_config(self,date_column,if_exists):
+      if if_exists not in self.WRITE_DISPOSITIONS:
+          raise ValueError(f"if_exists must be one of {tuple(self.WRITE_DISPOSITIONS)}")
+      return bigquery.LoadJobConfig(
+          write_disposition=self.WRITE_DISPOSITIONS[if_exists],
+          time_partitioning=bigquery.TimePartitioning(
+              type_=bigquery.TimePartitioningType.DAY,
+              field=date_column,
+          ),
+      )
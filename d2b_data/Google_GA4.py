@@ -1,16 +1,173 @@
+import contextvars
 import copy
 import datetime
+import json
+import os
 import random
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 from googleapiclient.errors import HttpError
 
 import d2b_data.Google_Token_MNG
+from d2b_data.disk_cache import DiskCache
+
+# Requests in flight of one top-level call, capped at max_workers. The nested pools
+# (days → shards → offsets) copy it into their workers, so they all share one cap.
+_request_slots = contextvars.ContextVar("ga4_request_slots", default=None)
+# Per-call override of quota_aware (get_report_df_many), None defers to the instance
+_quota_aware = contextvars.ContextVar("ga4_quota_aware", default=None)
+
+
+class _QuotaScheduler:
+    """
+    Paces the requests sent to one GA4 property using the propertyQuota returned by the API.
+
+    Hourly tokens are tracked as a token bucket that refills at limit / 3600 and is re-synced
+    with every response, so the client slows down before the hourly quota runs out instead of
+    reacting to 429s; each wait is capped at MAX_WAIT_SECONDS. Daily tokens do not refill
+    during the day, so they are never paced: reaching the daily reserve is only reported through
+    the log callback (the client's debug) and the API decides. Concurrency is capped at the concurrentRequests reported by the API.
+    """
+
+    BUCKET_PERIODS = {"tokensPerHour": 3600, "tokensPerDay": 86400}
+    # Solo la cuota por hora se recupera con el tiempo; la diaria no se espera
+    PACED_BUCKETS = ("tokensPerHour",)
+    # Margen que se deja libre para otros procesos que consultan la misma propiedad
+    RESERVE_FRACTION = 0.1
+    MAX_WAIT_SECONDS = 60
+    DEFAULT_CONCURRENT_REQUESTS = 10
+
+    def __init__(self, max_concurrent: int = DEFAULT_CONCURRENT_REQUESTS, log=None):
+        self.max_concurrent = max_concurrent
+        self.log = log or (lambda message: None)
+        self.in_flight = 0
+        self.request_cost = 0.0
+        self.buckets = {}
+        self.daily_reserve_reached = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Blocks until a concurrent slot is free and the hourly bucket can afford one more request."""
+        with self._condition:
+            while self.in_flight >= self.max_concurrent:
+                self._condition.wait()
+            self.in_flight += 1
+            wait_seconds = self._reserve_tokens()
+
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def release(self, property_quota: dict | None = None):
+        """Frees the slot and re-syncs the buckets with the quota returned by the request."""
+        with self._condition:
+            self.in_flight -= 1
+            if property_quota:
+                self._update(property_quota)
+            self._condition.notify_all()
+
+    def _reserve_tokens(self) -> float:
+        now = time.monotonic()
+        wait_seconds = 0.0
+
+        for name in self.PACED_BUCKETS:
+            bucket = self.buckets.get(name)
+            if bucket is None:
+                continue
+
+            rate = bucket["limit"] / bucket["period"]
+            bucket["tokens"] = min(
+                bucket["limit"], bucket["tokens"] + (now - bucket["updated_at"]) * rate
+            )
+            bucket["updated_at"] = now
+
+            needed = self.request_cost + self.RESERVE_FRACTION * bucket["limit"]
+            if bucket["tokens"] < needed and rate > 0:
+                wait_seconds = max(wait_seconds, (needed - bucket["tokens"]) / rate)
+
+            # El costo se descuenta ya, así los requests concurrentes se encolan en el tiempo
+            bucket["tokens"] -= self.request_cost
+
+        return min(wait_seconds, self.MAX_WAIT_SECONDS)
+
+    def _check_daily_reserve(self):
+        """Warns (once until the quota recovers) when the daily tokens reach the reserve."""
+        bucket = self.buckets.get("tokensPerDay")
+        if not bucket or not bucket["limit"]:
+            return
+
+        reached = bucket["tokens"] < self.RESERVE_FRACTION * bucket["limit"]
+        if reached and not self.daily_reserve_reached:
+            self.log(
+                f"GA4 property quota: only {bucket['tokens']} of ~{bucket['limit']} daily tokens "
+                "left; requests continue until the API rejects them."
+            )
+        self.daily_reserve_reached = reached
+
+    def _update(self, property_quota: dict):
+        now = time.monotonic()
+
+        for name, period in self.BUCKET_PERIODS.items():
+            status = property_quota.get(name)
+            if not status:
+                continue
+
+            consumed = int(status.get("consumed", 0))
+            remaining = int(status.get("remaining", 0))
+            bucket = self.buckets.setdefault(
+                name, {"limit": 0, "tokens": 0, "period": period, "updated_at": now}
+            )
+            # La API no informa el límite: el mayor remaining + consumed observado lo aproxima
+            bucket["limit"] = max(bucket["limit"], remaining + consumed)
+            bucket["tokens"] = remaining
+            bucket["updated_at"] = now
+
+            if name == "tokensPerHour":
+                # Promedio móvil del costo por request
+                self.request_cost = (
+                    consumed if not self.request_cost else 0.8 * self.request_cost + 0.2 * consumed
+                )
+
+        self._check_daily_reserve()
+
+        concurrent = property_quota.get("concurrentRequests")
+        if concurrent:
+            limit = int(concurrent.get("consumed", 0)) + int(concurrent.get("remaining", 0))
+            if limit > 0:
+                self.max_concurrent = limit
 
 
 class Google_GA4:
+    # Límites de la Data API: filas por request y requests por batchRunReports
+    MAX_ROWS_PER_REQUEST = 250000
+    MAX_REQUESTS_PER_BATCH = 5
+    MAX_DATE_RANGES_PER_REQUEST = 4
+    # Sin zona horaria de la propiedad se usa la primera en cambiar de día (UTC+14)
+    EARLIEST_DAY_TIMEZONE = "Etc/GMT-14"
+    # Tipo de métrica (metricHeaders[].type) → dtype de la columna
+    METRIC_DTYPES = {
+        "TYPE_INTEGER": "int64",
+        "TYPE_FLOAT": "float64",
+        "TYPE_CURRENCY": "float64",
+        "TYPE_SECONDS": "float64",
+        "TYPE_MILLISECONDS": "float64",
+        "TYPE_MINUTES": "float64",
+        "TYPE_HOURS": "float64",
+        "TYPE_STANDARD": "float64",
+        "TYPE_FEET": "float64",
+        "TYPE_MILES": "float64",
+        "TYPE_METERS": "float64",
+        "TYPE_KILOMETERS": "float64",
+    }
+
     def __init__(
         self,
         client_secret: str | None = None,
@@ -20,6 +177,19 @@ class Google_GA4:
         extract_sampling: bool = False,
         intraday_limit: int = 30,
         use_service_account: bool = False,
+        max_workers: int = 1,
+        adaptive_split: bool = False,
+        requests_per_batch: int = 1,
+        days_per_request: int = 1,
+        response_cache: DiskCache | None = None,
+        cache_mutable_days: int = 3,
+        property_timezone: str | None = None,
+        quota_aware: bool = False,
+        shard_dimension: str | None = None,
+        shard_prefixes: list | None = None,
+        max_shards: int = 100,
+        validate_queries: bool = False,
+        metadata_cache: DiskCache | None = None,
     ):
         self.default_api_name = "analyticsdata"
         self.default_version = "v1beta"
@@ -28,6 +198,35 @@ class Google_GA4:
         self.auto_paginate = auto_paginate
         self.extract_sampling = extract_sampling
         self.intraday_limit = intraday_limit * 100000
+        self.max_workers = max_workers
+        self.adaptive_split = adaptive_split
+        self.requests_per_batch = min(requests_per_batch, self.MAX_REQUESTS_PER_BATCH)
+        self.days_per_request = min(days_per_request, self.MAX_DATE_RANGES_PER_REQUEST)
+        # Caché opcional de días históricos; los últimos cache_mutable_days siempre van a la API
+        self.response_cache = response_cache
+        self.cache_mutable_days = cache_mutable_days
+        # Los días de GA4 siguen la zona horaria de la propiedad (p. ej. "America/Santiago")
+        self.property_timezone = property_timezone
+        # Un scheduler por propiedad, alimentado con el propertyQuota de cada respuesta
+        self.quota_aware = quota_aware
+        self._quota_schedulers = {}
+        self._quota_lock = threading.Lock()
+        # Dimensión usada para partir los días con filas "(other)"
+        self.shard_dimension = shard_dimension
+        self.shard_prefixes = shard_prefixes
+        # Sobre este número de valores no se parte por valor y el día queda con "(other)"
+        self.max_shards = max_shards
+        # Metadata y compatibilidad por propiedad: en memoria y, si se entrega, en disco con TTL
+        self.validate_queries = validate_queries
+        self.metadata_cache = metadata_cache
+        self._metadata = {}
+        self._compatibility = {}
+        self._metric_types = {}
+        self._metadata_lock = threading.Lock()
+        self.token_json = token_json
+        self.use_service_account = use_service_account
+        # httplib2 no es thread-safe: cada worker usa su propio service
+        self._owner_thread = threading.get_ident()
         self.service = self.create_service(
             self.client_secret, token_json, use_service_account
         )
@@ -93,12 +292,219 @@ class Google_GA4:
             self.extract_sampling = extract_sampling
         return self.extract_sampling
 
+    def set_max_workers(self, max_workers: int = 1):
+        """
+        Sets how many days are requested concurrently by the paginated report (1 = sequential)
+        """
+        if type(max_workers) == int and max_workers >= 1:
+            self.max_workers = max_workers
+        return self.max_workers
+
+    def set_adaptive_split(self, adaptive_split: bool = True):
+        """
+        Activates/deactivates the adaptive planner that only splits sampled or truncated windows
+        """
+        if type(adaptive_split) == bool:
+            self.adaptive_split = adaptive_split
+        return self.adaptive_split
+
+    def set_requests_per_batch(self, requests_per_batch: int = 1):
+        """
+        Sets how many daily sub-queries are packed into one batchRunReports call (max 5)
+        """
+        if type(requests_per_batch) == int and requests_per_batch >= 1:
+            self.requests_per_batch = min(requests_per_batch, self.MAX_REQUESTS_PER_BATCH)
+        return self.requests_per_batch
+
+    def set_days_per_request(self, days_per_request: int = 1):
+        """
+        Sets how many consecutive days are packed as dateRanges of one report request (max 4)
+        """
+        if type(days_per_request) == int and days_per_request >= 1:
+            self.days_per_request = min(days_per_request, self.MAX_DATE_RANGES_PER_REQUEST)
+        return self.days_per_request
+
+    def set_response_cache(
+        self,
+        response_cache: DiskCache | None = None,
+        cache_mutable_days: int = 3,
+        property_timezone: str | None = None,
+    ):
+        """
+        Sets (or removes, with None) the on-disk cache of historical daily responses.
+        property_timezone (IANA name) dates the mutable window in the property's days;
+        None keeps the current one.
+        """
+        self.response_cache = response_cache
+        self.cache_mutable_days = cache_mutable_days
+        if property_timezone is not None:
+            self.property_timezone = property_timezone
+        return self.response_cache
+
+    def set_quota_aware(self, quota_aware: bool = True):
+        """
+        Activates/deactivates pacing the requests with the propertyQuota returned by the API
+        """
+        if type(quota_aware) == bool:
+            self.quota_aware = quota_aware
+        return self.quota_aware
+
+    def set_cardinality_sharding(
+        self,
+        shard_dimension: str | None = None,
+        shard_prefixes: list | None = None,
+        max_shards: int | None = None,
+    ):
+        """
+        Sets the dimension used to shard the days that come back with "(other)" rows
+        (None disables it). Without prefixes one shard per value of the dimension is made,
+        up to max_shards values; with non-overlapping prefixes, one BEGINS_WITH shard per
+        prefix plus a remainder shard.
+        """
+        self.shard_dimension = shard_dimension
+        self.shard_prefixes = shard_prefixes
+        if max_shards is not None:
+            self.max_shards = max_shards
+        return self.shard_dimension
+
+    def set_validate_queries(self, validate_queries: bool = True):
+        """
+        Activates/deactivates the metadata/compatibility preflight before every report
+        """
+        if type(validate_queries) == bool:
+            self.validate_queries = validate_queries
+        return self.validate_queries
+
+    def get_metadata(self, property_id: str) -> dict:
+        """
+        Returns the getMetadata response of the property (dimensions and metrics available,
+        including custom ones), from memory, metadata_cache or the API, in that order.
+        Also registers the metric types used to cast the report columns.
+        """
+        with self._metadata_lock:
+            metadata = self._metadata.get(property_id)
+        if metadata is not None:
+            return metadata
+
+        cache_key = DiskCache.make_key("metadata", property_id)
+        if self.metadata_cache is not None:
+            metadata = self.metadata_cache.get(cache_key)
+
+        if metadata is None:
+            self.debug(f"Downloading metadata of {property_id}")
+            metadata = (
+                self._get_thread_service()
+                .properties()
+                .getMetadata(name=f"{property_id}/metadata")
+                .execute()
+            )
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(cache_key, metadata)
+
+        with self._metadata_lock:
+            self._metadata[property_id] = metadata
+            for metric in metadata.get("metrics", []):
+                if metric.get("type"):
+                    self._metric_types[metric.get("apiName")] = metric.get("type")
+        return metadata
+
+    def check_compatibility(self, property_id: str, query: dict) -> dict:
+        """
+        Returns the checkCompatibility response for the dimensions, metrics and filters of
+        the query, cached like the metadata.
+        """
+        request = query["requests"][0]
+        body = {
+            key: request[key]
+            for key in ("dimensions", "metrics", "dimensionFilter", "metricFilter")
+            if request.get(key)
+        }
+        cache_key = DiskCache.make_key("compatibility", property_id, body)
+
+        with self._metadata_lock:
+            compatibility = self._compatibility.get(cache_key)
+        if compatibility is not None:
+            return compatibility
+
+        if self.metadata_cache is not None:
+            compatibility = self.metadata_cache.get(cache_key)
+
+        if compatibility is None:
+            compatibility = (
+                self._get_thread_service()
+                .properties()
+                .checkCompatibility(property=property_id, body=body)
+                .execute()
+            )
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(cache_key, compatibility)
+
+        with self._metadata_lock:
+            self._compatibility[cache_key] = compatibility
+        return compatibility
+
+    def validate_query(self, property_id: str, query: dict):
+        """
+        Checks the query against the cached metadata and compatibility of the property
+        before any report call. Raises ValueError listing unknown or incompatible fields.
+        """
+        metadata = self.get_metadata(property_id)
+        known_dimensions = {item.get("apiName") for item in metadata.get("dimensions", [])}
+        known_metrics = {item.get("apiName") for item in metadata.get("metrics", [])}
+
+        request = query["requests"][0]
+        # Las expresiones (dimensionExpression / expression) no aparecen en la metadata
+        unknown = [
+            dimension.get("name")
+            for dimension in request.get("dimensions", [])
+            if "dimensionExpression" not in dimension
+            and dimension.get("name") not in known_dimensions
+        ] + [
+            metric.get("name")
+            for metric in request.get("metrics", [])
+            if "expression" not in metric and metric.get("name") not in known_metrics
+        ]
+        if unknown:
+            raise ValueError(f"Unknown fields for {property_id}: {', '.join(unknown)}")
+
+        compatibility = self.check_compatibility(property_id, query)
+        incompatible = [
+            item.get(metadata_key, {}).get("apiName")
+            for items_key, metadata_key in (
+                ("dimensionCompatibilities", "dimensionMetadata"),
+                ("metricCompatibilities", "metricMetadata"),
+            )
+            for item in compatibility.get(items_key, [])
+            if item.get("compatibility") == "INCOMPATIBLE"
+        ]
+        if incompatible:
+            raise ValueError(
+                f"Incompatible fields for {property_id}: {', '.join(incompatible)}"
+            )
+        return True
+
+    def get_property_quota(self, property_id: str):
+        """Returns the last token buckets observed for the property ({} if none yet)."""
+        scheduler = self._quota_schedulers.get(property_id)
+        if scheduler is None:
+            return {}
+        return copy.deepcopy(scheduler.buckets)
+
+    def _get_quota_scheduler(self, property_id: str):
+        """Returns the quota scheduler of the property, creating it on first use."""
+        with self._quota_lock:
+            scheduler = self._quota_schedulers.get(property_id)
+            if scheduler is None:
+                scheduler = _QuotaScheduler(log=self.debug)
+                self._quota_schedulers[property_id] = scheduler
+            return scheduler
+
     def create_service(
         self, secrets: str, credentials: str, use_service_account: bool = False
     ):
         """Creates the Google Analytics Data API service object using the provided credentials."""
 
-        token_mng = d2b_data.Google_Token_MNG.Google_Token_MNG(
+        self._token_mng = d2b_data.Google_Token_MNG.Google_Token_MNG(
             client_secret=secrets,  # Si es SA, esto es la ruta al JSON key
             token=credentials,  # Si es SA, esto puede ser None
             scopes=["https://www.googleapis.com/auth/analytics.readonly"],
@@ -106,36 +512,84 @@ class Google_GA4:
             api_name=self.default_api_name,
             use_service_account=use_service_account,  # <--- ¡Aquí está la magia!
         )
-
-        self.service = token_mng.get_service()
+        self.service = self._token_mng.get_service()
         self.debug("Conectado a GA4")
         return self.service
 
+    def _get_thread_service(self):
+        """
+        Returns the service object owned by the calling thread.
+        The thread that created the instance uses self.service; pool workers get their own
+        from the token manager's per-thread pool, built from the memoized credentials.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self.service
+        return self._token_mng.get_thread_service()
+
     def _to_df(self, raw_server_response: dict) -> pd.DataFrame:
         """
         Transforms the raw GA4 API response into a Pandas DataFrame.
+        Builds one array per header: dimensions become categoricals and metrics are cast
+        from metricHeaders[].type or the cached metadata (unknown types stay as strings).
         """
         if not raw_server_response.get("reports"):
             return pd.DataFrame()
 
         response = raw_server_response.get("reports")[0]
+        dimension_headers = response.get("dimensionHeaders", [])
+        metric_headers = response.get("metricHeaders", [])
+        rows = response.get("rows", [])
+
+        dimension_arrays = [np.empty(len(rows), dtype=object) for _ in dimension_headers]
+        metric_arrays = [np.empty(len(rows), dtype=object) for _ in metric_headers]
 
-        cols = []
-        for dimensions_cols in response.get("dimensionHeaders", []):
-            cols.append(dimensions_cols.get("name"))
-        for metrics_cols in response.get("metricHeaders", []):
-            cols.append(metrics_cols.get("name"))
+        for row_index, row in enumerate(rows):
+            for values, dimension in zip(dimension_arrays, row.get("dimensionValues", [])):
+                values[row_index] = dimension.get("value")
+            for values, metrics in zip(metric_arrays, row.get("metricValues", [])):
+                values[row_index] = metrics.get("value")
 
-        results = []
-        for row in response.get("rows", []):
-            row_array = []
-            for dimension in row.get("dimensionValues", []):
-                row_array.append(dimension.get("value"))
-            for metrics in row.get("metricValues", []):
-                row_array.append(metrics.get("value"))
-            results.append(row_array)
+        columns = {}
+        for header, values in zip(dimension_headers, dimension_arrays):
+            columns[header.get("name")] = pd.Categorical(values)
+        for header, values in zip(metric_headers, metric_arrays):
+            # Sin type en el header se usa el tipo de la metadata, si ya se cargó
+            metric_type = header.get("type") or self._metric_types.get(header.get("name"))
+            columns[header.get("name")] = self._cast_metric(values, metric_type)
 
-        return pd.DataFrame(results, columns=cols)
+        return pd.DataFrame(columns)
+
+    def _cast_metric(self, values: np.ndarray, metric_type: str | None):
+        """Casts the raw metric strings to the dtype of their GA4 metric type."""
+        dtype = self.METRIC_DTYPES.get(metric_type)
+        if dtype is None:
+            return values
+
+        numeric = pd.to_numeric(values, errors="coerce")
+        if dtype == "int64" and not np.isnan(numeric).any():
+            return numeric.astype("int64")
+        return numeric.astype("float64")
+
+    def _concat_frames(self, dataframes: list) -> pd.DataFrame:
+        """
+        Concatenates report pages keeping the dimensions categorical.
+        pd.concat falls back to object when the categories differ, so they are unified first.
+        """
+        unified_dtypes = {}
+        for column in dataframes[0].columns:
+            if all(
+                column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype)
+                for df in dataframes
+            ):
+                categories = pd.api.types.union_categoricals(
+                    [df[column] for df in dataframes]
+                ).categories
+                unified_dtypes[column] = pd.CategoricalDtype(categories)
+
+        if unified_dtypes:
+            dataframes = [df.astype(unified_dtypes) for df in dataframes]
+
+        return pd.concat(dataframes, ignore_index=True)
 
     def debug(self, message: str):
         """Prints debug messages if debug mode is enabled."""
@@ -145,18 +599,59 @@ class Google_GA4:
     def _get_report_raw(self, property_id: str, query: dict):
         """
         Executes the API call to retrieve the raw report data, with retry logic for handling rate limits and transient errors.
+        With quota_aware every attempt goes through the property's quota scheduler.
         """
-        max_retries = 5
-        retry_count = 0
+        scheduler = None
+        quota_aware = _quota_aware.get()
+        if quota_aware is None:
+            quota_aware = self.quota_aware
+        if quota_aware:
+            scheduler = self._get_quota_scheduler(property_id)
+            query = dict(
+                query,
+                requests=[
+                    dict(request, returnPropertyQuota=True)
+                    for request in query.get("requests", [])
+                ],
+            )
 
-        while True:
+        def run_batch():
+            if scheduler is not None:
+                waited = scheduler.acquire()
+                if waited:
+                    self.debug(f" Pacing for property quota: waited {waited:.2f}s")
+
+            property_quota = None
+            slots = _request_slots.get()
+            if slots is not None:
+                slots.acquire()
             try:
                 response = (
-                    self.service.properties()
+                    self._get_thread_service()
+                    .properties()
                     .batchRunReports(property=property_id, body=query)
                     .execute()
                 )
-                return response
+                property_quota = self._extract_property_quota(response)
+            finally:
+                if slots is not None:
+                    slots.release()
+                if scheduler is not None:
+                    scheduler.release(property_quota)
+            return response
+
+        return self._execute_with_retry(run_batch)
+
+    def _execute_with_retry(self, execute):
+        """
+        Runs execute() retrying rate limits (429) and transient errors (500/503) with exponential backoff.
+        """
+        max_retries = 5
+        retry_count = 0
+
+        while True:
+            try:
+                return execute()
 
             except HttpError as e:
                 status_code = e.resp.status
@@ -194,6 +689,80 @@ class Google_GA4:
                 else:
                     raise
 
+    def _extract_property_quota(self, response: dict):
+        """Returns the propertyQuota of the last report of a response, if any."""
+        for report in reversed(response.get("reports") or []):
+            if report.get("propertyQuota"):
+                return report["propertyQuota"]
+        return None
+
+    def _get_report_cached(self, property_id: str, query: dict):
+        """
+        Same as _get_report_raw, but serves the single-day requests older than the mutable
+        window from response_cache and only sends the misses to the API.
+        """
+        if self.response_cache is None:
+            return self._get_report_raw(property_id, query)
+
+        requests = query.get("requests", [])
+        keys = [self._cache_key(property_id, request) for request in requests]
+        reports = [self.response_cache.get(key) if key else None for key in keys]
+        missing = [index for index, report in enumerate(reports) if report is None]
+
+        if not missing:
+            self.debug("  → served from cache")
+            return {"reports": reports}
+
+        if len(missing) == len(requests):
+            missing_query = query
+        else:
+            missing_query = dict(query, requests=[requests[index] for index in missing])
+
+        res = self._get_report_raw(property_id, missing_query)
+
+        for index, report in zip(missing, res.get("reports", [])):
+            reports[index] = report
+            if keys[index]:
+                self.response_cache.set(keys[index], report)
+
+        if len(missing) == len(requests):
+            return res
+        return {"reports": reports}
+
+    def _cache_key(self, property_id: str, request: dict):
+        """
+        Returns the cache key of a request (property, normalized query hash, day, offset),
+        or None when it is not a single day older than the mutable window.
+        """
+        date_ranges = request.get("dateRanges", [])
+        if len(date_ranges) != 1:
+            return None
+
+        day_str = date_ranges[0].get("startDate")
+        if day_str != date_ranges[0].get("endDate"):
+            return None
+
+        try:
+            day = datetime.strptime(day_str, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            # Fechas relativas ("yesterday", "7daysAgo") no son inmutables
+            return None
+
+        if day > self._property_today() - timedelta(days=self.cache_mutable_days):
+            return None
+
+        normalized_query = {
+            key: value
+            for key, value in request.items()
+            if key not in ("dateRanges", "offset")
+        }
+        return DiskCache.make_key(
+            property_id,
+            DiskCache.make_key(normalized_query),
+            day_str,
+            request.get("offset", 0),
+        )
+
     def get_report_df(
         self, property_id: str, query: dict, extract_sampling=None
     ) -> pd.DataFrame:
@@ -203,16 +772,245 @@ class Google_GA4:
             extract_sampling if extract_sampling is not None else self.extract_sampling
         )
 
+        if self.validate_queries:
+            self.validate_query(property_id, query)
+
         if not self.auto_paginate:
             return self._get_single_report(property_id, query, should_extract)
 
+        if self.adaptive_split:
+            return self._get_adaptive_report(property_id, query, should_extract)
+
         return self._get_paginated_report(property_id, query, should_extract)
 
+    def poll_realtime(
+        self,
+        property_id: str,
+        query: dict,
+        interval: float = 60,
+        max_polls: int | None = None,
+    ):
+        """
+        Long-lived realtime poller: calls runRealtimeReport every interval seconds reusing
+        this client's service, and yields after each poll a DataFrame with only the rows
+        that are new or whose metrics changed since the previous poll (the first poll yields
+        every row). Runs forever unless max_polls is given.
+        The query is a RunRealtimeReportRequest body; a batch-style {"requests": [...]}
+        query is also accepted and its first request is used.
+        """
+        if "requests" in query:
+            body = {
+                key: value
+                for key, value in query["requests"][0].items()
+                if key not in ("dateRanges", "offset")
+            }
+        else:
+            body = query
+
+        previous_rows = None
+        polls = 0
+
+        while True:
+            started = time.monotonic()
+            response = self._execute_with_retry(
+                lambda: self._get_thread_service()
+                .properties()
+                .runRealtimeReport(property=property_id, body=body)
+                .execute()
+            )
+            current_df = self._to_df({"reports": [response]})
+            dimension_names = [
+                header.get("name") for header in response.get("dimensionHeaders", [])
+            ]
+
+            current_rows = self._rows_by_dimensions(current_df, dimension_names)
+            if previous_rows is None:
+                delta_df = current_df
+            else:
+                changed = [
+                    previous_rows.get(key) != values for key, values in current_rows
+                ]
+                delta_df = current_df[changed].reset_index(drop=True)
+
+            previous_rows = dict(current_rows)
+            polls += 1
+            self.debug(f"Realtime poll {polls}: {len(delta_df)} changed rows")
+            yield delta_df
+
+            if max_polls is not None and polls >= max_polls:
+                return
+
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def _rows_by_dimensions(self, df: pd.DataFrame, dimension_names: list) -> list:
+        """Returns (dimension values, metric values) tuples, one per row of df."""
+        metric_names = [column for column in df.columns if column not in dimension_names]
+        key_values = df[dimension_names].itertuples(index=False, name=None)
+        metric_values = df[metric_names].itertuples(index=False, name=None)
+        return list(zip(key_values, metric_values))
+
+    def get_report_df_many(
+        self,
+        property_ids: list,
+        query: dict,
+        extract_sampling=None,
+        max_property_workers: int = 4,
+        quota_aware: bool = True,
+    ):
+        """
+        Runs the same query against several properties concurrently, reusing this client
+        (credentials and per-property quota schedulers). Rows are tagged with property_id.
+        Requests are paced by the quota schedulers unless quota_aware=False, whatever the
+        instance setting. A failing property does not abort the others.
+        Returns (DataFrame, status) where status maps each property to
+        {"status": "ok", "rows": n} or {"status": "error", "error": message}.
+        """
+
+        def fetch_property(property_id):
+            _quota_aware.set(quota_aware)
+            try:
+                df_report = self.get_report_df(property_id, query, extract_sampling)
+            except Exception as e:
+                self.debug(f" {property_id} failed: {e}")
+                return property_id, None, e
+            df_report.insert(
+                0, "property_id", pd.Categorical([property_id] * len(df_report))
+            )
+            return property_id, df_report, None
+
+        all_dataframes = []
+        status = {}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_property_workers))
+        try:
+            # Cada propiedad corre en una copia del contexto: el override no sale de esta llamada
+            for property_id, df_report, error in executor.map(
+                lambda property_id: contextvars.copy_context().run(fetch_property, property_id),
+                property_ids,
+            ):
+                if error is not None:
+                    status[property_id] = {"status": "error", "error": str(error)}
+                    continue
+
+                status[property_id] = {"status": "ok", "rows": len(df_report)}
+                if not df_report.empty:
+                    all_dataframes.append(df_report)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        failed = sum(1 for result in status.values() if result["status"] == "error")
+        self.debug(f"Properties: {len(status) - failed} ok, {failed} failed")
+
+        if not all_dataframes:
+            return pd.DataFrame(), status
+        return self._concat_frames(all_dataframes), status
+
+    def get_report_df_incremental(
+        self,
+        property_id: str,
+        query: dict,
+        state_file: str,
+        lookback_days: int = 3,
+        extract_sampling=None,
+    ) -> pd.DataFrame:
+        """
+        Retrieves only the days after the stored watermark of (property, query), plus the
+        last lookback_days already loaded because GA4 keeps updating them for a while.
+        On the first run the whole range of the query is fetched. The watermark is saved
+        in state_file once the report is obtained; the synced range is returned in
+        df.attrs["incremental_range"] so the caller can replace those days downstream.
+        """
+        original_date_ranges = query["requests"][0]["dateRanges"]
+        start = self._resolve_date(original_date_ranges[0]["startDate"])
+        end = self._resolve_date(original_date_ranges[0]["endDate"])
+
+        state_key = self._sync_state_key(property_id, query)
+        state = self._load_sync_state(state_file)
+        watermark = state.get(state_key, {}).get("watermark")
+
+        if watermark:
+            resume = datetime.strptime(watermark, "%Y-%m-%d") - timedelta(
+                days=max(lookback_days, 0) - 1
+            )
+            start = max(start, resume)
+
+        start_str = start.strftime("%Y-%m-%d")
+        end_str = end.strftime("%Y-%m-%d")
+
+        if start > end:
+            self.debug(f"Nothing new since watermark {watermark}")
+            return pd.DataFrame()
+
+        self.debug(f"Incremental sync from {start_str} to {end_str} (watermark: {watermark})")
+        delta_query = self._create_daily_query(query, start_str, end_str)
+        df_report = self.get_report_df(property_id, delta_query, extract_sampling)
+        df_report.attrs["incremental_range"] = (start_str, end_str)
+
+        # Releer el estado por si otro proceso actualizó otra query en el intertanto
+        state = self._load_sync_state(state_file)
+        if not watermark or end_str > watermark:
+            state[state_key] = {
+                "property_id": property_id,
+                "watermark": end_str,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save_sync_state(state_file, state)
+
+        return df_report
+
+    def _property_today(self):
+        """
+        Returns today's date in the property timezone. Without property_timezone the
+        earliest timezone is used, so no day that can still change is taken as final.
+        """
+        timezone = ZoneInfo(self.property_timezone or self.EARLIEST_DAY_TIMEZONE)
+        return datetime.now(timezone).date()
+
+    def _resolve_date(self, date_str: str) -> datetime:
+        """Converts a GA4 date (YYYY-MM-DD, today, yesterday or NdaysAgo) into a datetime."""
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        if date_str == "today":
+            return today
+        if date_str == "yesterday":
+            return today - timedelta(days=1)
+
+        days_ago = re.fullmatch(r"(\d+)daysAgo", date_str)
+        if days_ago:
+            return today - timedelta(days=int(days_ago.group(1)))
+
+        return datetime.strptime(date_str, "%Y-%m-%d")
+
+    def _sync_state_key(self, property_id: str, query: dict) -> str:
+        """Identifies a (property, query) pair regardless of the requested dates."""
+        normalized_query = copy.deepcopy(query)
+        for request in normalized_query.get("requests", []):
+            request.pop("dateRanges", None)
+            request.pop("offset", None)
+        return DiskCache.make_key(property_id, normalized_query)
+
+    def _load_sync_state(self, state_file: str) -> dict:
+        """Reads the watermark state file; a missing file is an empty state."""
+        if not os.path.isfile(state_file):
+            return {}
+        with open(state_file, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _save_sync_state(self, state_file: str, state: dict):
+        """Writes the watermark state atomically so a crash never leaves it half written."""
+        temp_file = f"{state_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+        os.replace(temp_file, state_file)
+
     def _get_single_report(
         self, property_id: str, query: dict, extract_sampling: bool = False
     ):
         """Obtains a single report without pagination, with optional sampling info extraction."""
-        res = self._get_report_raw(property_id, query)
+        res = self._get_report_cached(property_id, query)
+        return self._response_to_df(res, extract_sampling)
+
+    def _response_to_df(self, res: dict, extract_sampling: bool = False):
+        """Converts a raw response into a DataFrame, adding the sampling columns if requested."""
         df_report = self._to_df(res)
 
         # Agregar info de sampling si está activada
@@ -227,11 +1025,75 @@ class Google_GA4:
 
         return df_report
 
+    def iter_report(
+        self, property_id: str, query: dict, extract_sampling=None, as_arrow: bool = False
+    ):
+        """
+        Yields the report page by page, in date order, as the pages arrive instead of
+        concatenating everything in memory. Always slices by day (adaptive_split is not
+        used); with max_workers > 1 only a bounded number of days is in flight at a time.
+        With as_arrow=True every page is yielded as a pyarrow RecordBatch.
+        """
+        should_extract = (
+            extract_sampling if extract_sampling is not None else self.extract_sampling
+        )
+
+        if self.validate_queries:
+            self.validate_query(property_id, query)
+
+        if not self.auto_paginate:
+            pages = iter([self._get_single_report(property_id, query, should_extract)])
+        else:
+            pages = self._iter_paginated_report(property_id, query, should_extract)
+
+        if as_arrow:
+            pa = self._import_pyarrow()
+
+        for page_df in pages:
+            if page_df.empty:
+                continue
+            if as_arrow:
+                yield pa.RecordBatch.from_pandas(page_df, preserve_index=False)
+            else:
+                yield page_df
+
+    def _import_pyarrow(self):
+        """Lazy import: pyarrow is only needed to stream record batches."""
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("pyarrow is required for as_arrow=True: pip install pyarrow")
+        return pyarrow
+
     def _get_paginated_report(
         self, property_id: str, query: dict, extract_sampling: bool = False
     ):
         """
         Obtains a report with automatic pagination, iterating day by day to avoid sampling and API limits.
+        With max_workers > 1 the days are requested concurrently and reassembled in date order.
+        With requests_per_batch > 1 up to five days travel in each batchRunReports call,
+        and with days_per_request > 1 up to four days travel as dateRanges of each request.
+        """
+        # Lista para almacenar DataFrames
+        all_dataframes = list(
+            self._iter_paginated_report(property_id, query, extract_sampling)
+        )
+
+        # Combinar resultados
+        if all_dataframes:
+            result_df = self._concat_frames(all_dataframes)
+            self.debug(f"Total of rows obtained: {len(result_df)}")
+            return result_df
+        else:
+            self.debug("No data found for the specified period.")
+            return pd.DataFrame()
+
+    def _iter_paginated_report(
+        self, property_id: str, query: dict, extract_sampling: bool = False
+    ):
+        """
+        Day-sliced engine behind _get_paginated_report and iter_report: yields every page
+        DataFrame in date order.
         """
         # Extraer rango de fechas
         original_date_ranges = query["requests"][0]["dateRanges"]
@@ -244,78 +1106,456 @@ class Google_GA4:
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
 
-        # Lista para almacenar DataFrames
-        all_dataframes = []
+        days = []
         current_date = start
-
-        # Iterar día por día
         while current_date <= end:
-            day_str = current_date.strftime("%Y-%m-%d")
-            self.debug(f"Consulting day: {day_str}")
+            days.append(current_date.strftime("%Y-%m-%d"))
+            current_date += timedelta(days=1)
 
-            # Obtener todas las filas del día
-            day_dataframes = self._get_all_rows_for_day(
+        def fetch_day(day_str):
+            self.debug(f"Consulting day: {day_str}")
+            return self._get_all_rows_for_day(
                 property_id, query, day_str, extract_sampling
             )
 
+        def fetch_days(batch_days):
+            self.debug(f"Consulting days: {', '.join(batch_days)}")
+            return self._get_all_rows_for_days(
+                property_id, query, batch_days, extract_sampling
+            )
+
+        days_per_call = self.requests_per_batch * self.days_per_request
+        if days_per_call > 1:
+            day_groups = [
+                days[index : index + days_per_call]
+                for index in range(0, len(days), days_per_call)
+            ]
+            per_day_results = (
+                day_dataframes
+                for group_results in self._map_concurrent(fetch_days, day_groups)
+                for day_dataframes in group_results
+            )
+        else:
+            per_day_results = self._map_concurrent(fetch_day, days)
+
+        for day_dataframes in per_day_results:
             if day_dataframes:
-                all_dataframes.extend(day_dataframes)
+                yield from day_dataframes
 
-            current_date += timedelta(days=1)
+    def _map_concurrent(self, func, items: list):
+        """
+        Applies func to every item, through a thread pool when max_workers > 1.
+        Results are yielded in the same order as items. At most 2 * max_workers items
+        are in flight, so a slow consumer never piles up finished results in memory.
+        The outermost call creates the request limiter that nested calls share, so no more
+        than max_workers API calls run at once however deep the pools are nested.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        context = contextvars.copy_context()
+        if _request_slots.get() is None:
+            context.run(_request_slots.set, threading.BoundedSemaphore(self.max_workers))
+
+        def run(item):
+            # Cada tarea corre en su propia copia: un Context no se comparte entre hilos
+            return context.copy().run(func, item)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        in_flight = deque()
+        pending_items = iter(items)
+        try:
+            for item in pending_items:
+                in_flight.append(executor.submit(run, item))
+                if len(in_flight) >= 2 * self.max_workers:
+                    break
+
+            while in_flight:
+                result = in_flight.popleft().result()
+                for item in pending_items:
+                    in_flight.append(executor.submit(run, item))
+                    break
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_adaptive_report(
+        self, property_id: str, query: dict, extract_sampling: bool = False
+    ):
+        """
+        Obtains a report requesting the whole range first and bisecting only the windows
+        that come back sampled, with "(other)" rows or truncated (rowCount above the rows received).
+        Single-day windows fall back to the offset pagination of _get_all_rows_for_day.
+        Rows are only equivalent to the day-by-day paginator when the query includes the date dimension.
+        """
+        original_date_ranges = query["requests"][0]["dateRanges"]
+        start = datetime.strptime(original_date_ranges[0]["startDate"], "%Y-%m-%d")
+        end = datetime.strptime(original_date_ranges[0]["endDate"], "%Y-%m-%d")
+
+        def fetch_window(window):
+            return self._get_window_rows(property_id, query, window, extract_sampling)
+
+        # Cada ronda consulta todas las ventanas pendientes y parte en dos las que fallan
+        results = {}
+        pending = [(start, end)]
+        requests_count = 0
+        while pending:
+            next_pending = []
+            for window, window_dataframes in zip(
+                pending, self._map_concurrent(fetch_window, pending)
+            ):
+                requests_count += 1
+                if window_dataframes is None:
+                    window_start, window_end = window
+                    middle = window_start + timedelta(
+                        days=(window_end - window_start).days // 2
+                    )
+                    next_pending.append((window_start, middle))
+                    next_pending.append((middle + timedelta(days=1), window_end))
+                else:
+                    results[window[0]] = window_dataframes
+            pending = next_pending
+
+        self.debug(f"Adaptive planner used {requests_count} windows")
+
+        all_dataframes = []
+        for window_start in sorted(results):
+            all_dataframes.extend(results[window_start])
 
-        # Combinar resultados
         if all_dataframes:
-            result_df = pd.concat(all_dataframes, ignore_index=True)
+            result_df = self._concat_frames(all_dataframes)
             self.debug(f"Total of rows obtained: {len(result_df)}")
             return result_df
         else:
             self.debug("No data found for the specified period.")
             return pd.DataFrame()
 
+    def _get_window_rows(
+        self,
+        property_id: str,
+        query: dict,
+        window: tuple,
+        extract_sampling: bool = False,
+    ):
+        """
+        Obtains the rows of a date window, or None when the window must be split.
+        """
+        window_start, window_end = window
+        start_str = window_start.strftime("%Y-%m-%d")
+        end_str = window_end.strftime("%Y-%m-%d")
+
+        if window_start == window_end:
+            return self._get_all_rows_for_day(property_id, query, start_str, extract_sampling)
+
+        self.debug(f"Consulting window: {start_str} → {end_str}")
+        window_query = self._create_daily_query(query, start_str, end_str)
+        # Sin limit explícito la API corta en 10.000 filas; un tope del usuario
+        # tampoco aplica a la ventana, solo decide si hay que partirla
+        window_query["requests"][0]["limit"] = self.MAX_ROWS_PER_REQUEST
+        res = self._get_report_cached(property_id, window_query)
+
+        report = (res.get("reports") or [{}])[0]
+        sampling_info = self._extract_sampling_info(report)
+        truncated = int(report.get("rowCount", 0)) > self.MAX_ROWS_PER_REQUEST
+
+        if sampling_info["sampled"] or sampling_info["dataLossFromOtherRow"] or truncated:
+            self.debug(f"  → splitting {start_str} → {end_str}")
+            return None
+
+        df_report = self._response_to_df(res, extract_sampling)
+        return [df_report] if not df_report.empty else []
+
     def _get_all_rows_for_day(
         self,
         property_id: str,
         query: dict,
         day_str: str,
         extract_sampling: bool = False,
+        allow_sharding: bool = True,
     ):
         """
-        Obtains all rows for a specific day using offset
+        Obtains all rows for a specific day using offset.
+        The rowCount of the first page gives every remaining offset, which are fetched
+        concurrently; no trailing empty request is made.
+        If the day comes back with "(other)" rows and shard_dimension is set, it is fetched in shards.
         """
-        day_dataframes = []
-        offset = 0
-        limit_per_request = 250000
+        limit_per_request = self.MAX_ROWS_PER_REQUEST
 
-        while True:
+        def page_query(offset):
             # Crear query para este día con offset
             daily_query = self._create_daily_query(query, day_str, day_str)
             daily_query["requests"][0]["offset"] = offset
+            # Sin limit explícito la API devuelve 10.000 filas y los offsets no calzarían
+            daily_query["requests"][0].setdefault("limit", limit_per_request)
+            return daily_query
 
+        def fetch_page(offset):
             self.debug(f"  → offset {offset}")
+            res = self._get_report_cached(property_id, page_query(offset))
+            return self._response_to_df(res, extract_sampling)
 
-            # Ejecutar query
-            daily_df = self._get_single_report(
-                property_id, daily_query, extract_sampling
-            )
+        first_query = page_query(0)
+        self.debug("  → offset 0")
+        res = self._get_report_cached(property_id, first_query)
 
-            if daily_df.empty:
-                break
+        if allow_sharding and self._needs_sharding(res):
+            sharded_dataframes = self._get_sharded_rows_for_day(
+                property_id, query, day_str, extract_sampling
+            )
+            if sharded_dataframes is not None:
+                return sharded_dataframes
 
-            rows_received = len(daily_df)
-            day_dataframes.append(daily_df)
+        first_df = self._response_to_df(res, extract_sampling)
+        if first_df.empty:
+            return []
 
-            # Si recibimos menos de 250k, no hay más datos
-            if rows_received < limit_per_request:
-                break
+        day_dataframes = [first_df]
+        page_size = int(first_query["requests"][0]["limit"])
 
-            offset += limit_per_request
+        # Un limit menor al máximo es un tope pedido por el usuario: no se pagina
+        if page_size >= limit_per_request and len(first_df) >= page_size:
+            report = (res.get("reports") or [{}])[0]
+            if "rowCount" in report:
+                offsets = list(range(page_size, int(report["rowCount"]), page_size))
+                for page_df in self._map_concurrent(fetch_page, offsets):
+                    if not page_df.empty:
+                        day_dataframes.append(page_df)
+            else:
+                # Sin rowCount se avanza página por página hasta una incompleta
+                offset = page_size
+                while True:
+                    page_df = fetch_page(offset)
+                    if page_df.empty:
+                        break
+                    day_dataframes.append(page_df)
+                    if len(page_df) < page_size:
+                        break
+                    offset += page_size
 
         total_rows = sum(len(df) for df in day_dataframes)
-        if total_rows > 0:
-            self.debug(f" Total rows for the day: {total_rows}")
+        self.debug(f" Total rows for the day: {total_rows}")
+
+        return day_dataframes
+
+    def _needs_sharding(self, res: dict) -> bool:
+        """True when sharding is configured and the response lost rows into "(other)"."""
+        if not self.shard_dimension:
+            return False
+        return any(
+            self._extract_sampling_info(report)["dataLossFromOtherRow"]
+            for report in res.get("reports") or []
+        )
+
+    def _get_sharded_rows_for_day(
+        self,
+        property_id: str,
+        query: dict,
+        day_str: str,
+        extract_sampling: bool = False,
+    ):
+        """
+        Fetches a day split by shard_dimension, shards in parallel, and merges them.
+        Returns None when no shard could be planned. Shards share the request limit of the
+        call. Rows are only complete per shard, so shard_dimension must be one of the query
+        dimensions: otherwise the merged shards would repeat rows that cannot be told apart.
+        """
+        dimensions = [
+            dimension.get("name") for dimension in query["requests"][0].get("dimensions", [])
+        ]
+        if self.shard_dimension not in dimensions:
+            raise ValueError(
+                f"shard_dimension {self.shard_dimension!r} must be one of the query dimensions {dimensions}"
+            )
+
+        shard_filters = self._get_shard_filters(property_id, query, day_str)
+        if not shard_filters:
+            return None
 
+        self.debug(
+            f"  → (other) rows on {day_str}: {len(shard_filters)} shards by {self.shard_dimension}"
+        )
+
+        def fetch_shard(shard_filter):
+            shard_query = self._create_shard_query(query, shard_filter)
+            return self._get_all_rows_for_day(
+                property_id, shard_query, day_str, extract_sampling, allow_sharding=False
+            )
+
+        day_dataframes = []
+        for shard_dataframes in self._map_concurrent(fetch_shard, shard_filters):
+            day_dataframes.extend(shard_dataframes)
         return day_dataframes
 
+    def _get_shard_filters(self, property_id: str, query: dict, day_str: str):
+        """
+        Builds the dimensionFilter expressions that partition a day by shard_dimension.
+        """
+        if self.shard_prefixes:
+            prefix_filters = [
+                self._string_filter(self.shard_dimension, "BEGINS_WITH", prefix)
+                for prefix in self.shard_prefixes
+            ]
+            remainder_filter = {"notExpression": {"orGroup": {"expressions": prefix_filters}}}
+            return prefix_filters + [remainder_filter]
+
+        # Descubrir los valores de la dimensión en el día con una consulta liviana
+        original_request = query["requests"][0]
+        values_request = {
+            "dateRanges": [{"startDate": day_str, "endDate": day_str}],
+            "dimensions": [{"name": self.shard_dimension}],
+            "metrics": original_request.get("metrics", [])[:1],
+            "limit": self.MAX_ROWS_PER_REQUEST,
+        }
+        if original_request.get("dimensionFilter"):
+            values_request["dimensionFilter"] = original_request["dimensionFilter"]
+
+        res = self._get_report_cached(property_id, {"requests": [values_request]})
+        values_df = self._to_df(res)
+        if values_df.empty or self.shard_dimension not in values_df.columns:
+            return None
+
+        values = values_df[self.shard_dimension].tolist()
+        if "(other)" in values:
+            self.debug(f"  → {self.shard_dimension} also has (other) rows; shards may stay lossy")
+
+        values = [value for value in values if value != "(other)"]
+        if len(values) > self.max_shards:
+            self.debug(
+                f"GA4 sharding: {day_str} has {len(values)} values of {self.shard_dimension} "
+                f"(max_shards={self.max_shards}); keeping the unsharded rows with (other). "
+                "Use shard_prefixes to shard it."
+            )
+            return None
+
+        return [self._string_filter(self.shard_dimension, "EXACT", value) for value in values]
+
+    def _string_filter(self, field_name: str, match_type: str, value: str) -> dict:
+        """Builds a case-sensitive stringFilter expression."""
+        return {
+            "filter": {
+                "fieldName": field_name,
+                "stringFilter": {
+                    "matchType": match_type,
+                    "value": value,
+                    "caseSensitive": True,
+                },
+            }
+        }
+
+    def _create_shard_query(self, original_query: dict, shard_filter: dict) -> dict:
+        """
+        Creates a copy of the query restricted to one shard (AND with any existing dimensionFilter)
+        """
+        shard_query = copy.deepcopy(original_query)
+        request = shard_query["requests"][0]
+        existing_filter = request.get("dimensionFilter")
+        if existing_filter:
+            request["dimensionFilter"] = {
+                "andGroup": {"expressions": [existing_filter, shard_filter]}
+            }
+        else:
+            request["dimensionFilter"] = shard_filter
+        return shard_query
+
+    def _get_all_rows_for_days(
+        self,
+        property_id: str,
+        query: dict,
+        days: list,
+        extract_sampling: bool = False,
+    ):
+        """
+        Obtains all rows for several days. Consecutive days are packed as days_per_request
+        dateRanges of one request, and up to requests_per_batch (days, offset) requests go
+        in each batchRunReports call. Returns one list of DataFrames per day.
+        """
+        limit_per_request = self.MAX_ROWS_PER_REQUEST
+        day_dataframes = {day_str: [] for day_str in days}
+        pending = [
+            (tuple(days[index : index + self.days_per_request]), 0)
+            for index in range(0, len(days), self.days_per_request)
+        ]
+        lossy_days = []
+
+        while pending:
+            batch = pending[: self.requests_per_batch]
+            pending = pending[self.requests_per_batch :]
+
+            batch_query = {"requests": []}
+            for group_days, offset in batch:
+                group_query = self._create_multi_day_query(query, group_days)
+                group_query["requests"][0]["offset"] = offset
+                group_query["requests"][0].setdefault("limit", limit_per_request)
+                batch_query["requests"].append(group_query["requests"][0])
+
+            self.debug(f"  → batch of {len(batch)} requests")
+            res = self._get_report_cached(property_id, batch_query)
+
+            # batchRunReports devuelve los reports en el orden de los requests
+            for (group_days, offset), report in zip(batch, res.get("reports", [])):
+                if offset == 0 and self._needs_sharding({"reports": [report]}):
+                    # Se vuelve a pedir por shards una vez terminado el batch
+                    lossy_days.extend(group_days)
+                    continue
+
+                group_df = self._response_to_df({"reports": [report]}, extract_sampling)
+                if group_df.empty:
+                    continue
+
+                for day_str, daily_df in self._split_by_date_range(group_df, group_days):
+                    day_dataframes[day_str].append(daily_df)
+
+                # Si recibimos el máximo, puede haber más filas en el grupo
+                if len(group_df) >= limit_per_request:
+                    pending.append((group_days, offset + limit_per_request))
+
+        for day_str in lossy_days:
+            sharded_dataframes = self._get_sharded_rows_for_day(
+                property_id, query, day_str, extract_sampling
+            )
+            if sharded_dataframes is None:
+                sharded_dataframes = self._get_all_rows_for_day(
+                    property_id, query, day_str, extract_sampling, allow_sharding=False
+                )
+            day_dataframes[day_str] = sharded_dataframes
+
+        return [day_dataframes[day_str] for day_str in days]
+
+    def _split_by_date_range(self, group_df: pd.DataFrame, group_days: tuple):
+        """
+        Splits the rows of a multi-dateRange response back into one DataFrame per day,
+        using the dateRange dimension (named after each day) and dropping it.
+        """
+        if len(group_days) == 1:
+            return [(group_days[0], group_df)]
+
+        if "dateRange" not in group_df.columns:
+            raise ValueError("Multi-dateRange response without the dateRange dimension")
+
+        date_ranges = group_df["dateRange"].astype(str)
+        day_frames = []
+        for day_str in group_days:
+            daily_df = group_df[date_ranges == day_str].drop(columns="dateRange")
+            if not daily_df.empty:
+                day_frames.append((day_str, daily_df.reset_index(drop=True)))
+        return day_frames
+
+    def _create_multi_day_query(self, original_query: dict, days: tuple) -> dict:
+        """
+        Creates a copy of the query with one dateRange per day, named after the day
+        """
+        if len(days) == 1:
+            return self._create_daily_query(original_query, days[0], days[0])
+
+        multi_day_query = copy.deepcopy(original_query)
+        multi_day_query["requests"][0]["dateRanges"] = [
+            {"startDate": day_str, "endDate": day_str, "name": day_str}
+            for day_str in days
+        ]
+        return multi_day_query
+
     def _create_daily_query(
         self, original_query: dict, start_date: str, end_date: str
     ) -> dict:
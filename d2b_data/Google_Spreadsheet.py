@@ -1,3 +1,5 @@
+import threading
+
 import pandas as pd
 # CORRECCIÓN 1: Importamos correctamente la clase desde el módulo
 from d2b_data.Google_Token_MNG import Google_Token_MNG 
@@ -25,14 +27,22 @@ class Google_Spreadsheet:
     )
     
     self.service = self.token_manager.get_service()
+    # httplib2 no es thread-safe: otros hilos usan su propio service
+    self._owner_thread = threading.get_ident()
+
+  def _get_service(self):
+    """Returns self.service on the creating thread and a per-thread service elsewhere."""
+    if threading.get_ident() == self._owner_thread:
+      return self.service
+    return self.token_manager.get_thread_service()
 
   def get_spreadsheet(self):
-    request = self.service.spreadsheets()
+    request = self._get_service().spreadsheets()
     return request
 
   def read_data_dataframe(self,spreadsheetId,range_name):
     try:
-        request = self.service.spreadsheets().values().get(spreadsheetId=spreadsheetId, range=range_name)
+        request = self._get_service().spreadsheets().values().get(spreadsheetId=spreadsheetId, range=range_name)
         response = request.execute()
         
         if 'values' not in response:
@@ -86,13 +96,13 @@ class Google_Spreadsheet:
         }
       ]
     }
-    self.service.spreadsheets().batchUpdate(spreadsheetId=spreadsheetId, body = body_request).execute()
+    self._get_service().spreadsheets().batchUpdate(spreadsheetId=spreadsheetId, body = body_request).execute()
     print(f'Data eliminada en el rango {start_index}:{end_index} ({vector})')
     return True
 
   def update_data(self, spreadsheet_id, range_index, data_list):
     body_request = {'values': data_list}
-    self.service.spreadsheets().values().update(
+    self._get_service().spreadsheets().values().update(
         spreadsheetId=spreadsheet_id, 
         range=range_index, 
         valueInputOption='USER_ENTERED', 
@@ -104,7 +114,7 @@ class Google_Spreadsheet:
   def append_data(self, spreadsheet_id, range_index, data_list):
     print(f"Agregando {len(data_list)} filas...")
     body_request = {'values': data_list}
-    self.service.spreadsheets().values().append(
+    self._get_service().spreadsheets().values().append(
         spreadsheetId=spreadsheet_id, 
         range=range_index, 
         valueInputOption='USER_ENTERED', 
@@ -1,15 +1,186 @@
 import json
 import os
+import tempfile
+import threading
 import time
 import webbrowser
+from collections.abc import Callable
+from datetime import UTC, datetime
 
 import google.auth
+import google.oauth2.credentials
 import httplib2
+import requests
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from oauth2client import client
 
 
+class _SessionHttp:
+    """
+    httplib2-compatible adapter over a pooled, keep-alive requests session.
+
+    googleapiclient only talks to objects with httplib2's `request()`
+    signature; this adapter lets its services reuse the session's urllib3
+    connection pool (and TLS handshakes) across requests and clients.
+    """
+
+    def __init__(self, session: requests.Session, gzip: bool = True):
+        self.session = session
+        self.gzip = gzip
+
+    def request(
+        self,
+        uri,
+        method="GET",
+        body=None,
+        headers=None,
+        redirections=5,
+        connection_type=None,
+    ):
+        request_headers = dict(headers or {})
+
+        if self.gzip:
+            # Google only compresses responses for user agents that mention gzip
+            request_headers["accept-encoding"] = "gzip"
+            user_agent = request_headers.get("user-agent", "")
+            if "gzip" not in user_agent:
+                request_headers["user-agent"] = f"{user_agent} (gzip)".strip()
+
+        response = self.session.request(
+            method,
+            uri,
+            data=body,
+            headers=request_headers,
+            allow_redirects=redirections > 0,
+        )
+
+        info = {key.lower(): value for key, value in response.headers.items()}
+        if info.pop("content-encoding", None):
+            # requests already decompressed the body
+            info.pop("content-length", None)
+        info["status"] = str(response.status_code)
+
+        return httplib2.Response(info), response.content
+
+    def close(self):
+        # The session is shared by every service of the process
+        pass
+
+
+class _AtomicTokenStorage(client.Storage):
+    """
+    oauth2client storage for a token file.
+
+    oauth2client refreshes through the credentials' store while holding its
+    lock: concurrent refreshes are serialized (the threads that were waiting
+    reuse the token written by the first one) and every refreshed token is
+    persisted, atomically so a crash never leaves the file half written.
+    """
+
+    def __init__(self, token_path: str, read_json: Callable[[str], str]):
+        super().__init__(lock=threading.Lock())
+        self.token_path = token_path
+        # Same reader as the initial load, so double-encoded tokens are unwrapped
+        self.read_json = read_json
+
+    def locked_get(self):
+        try:
+            credentials = client.Credentials.new_from_json(self.read_json(self.token_path))
+        except (OSError, ValueError, KeyError):
+            return None
+
+        credentials.set_store(self)
+        return credentials
+
+    def locked_put(self, credentials):
+        directory = os.path.dirname(os.path.abspath(self.token_path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(credentials.to_json())
+            os.replace(temp_path, self.token_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def locked_delete(self):
+        if os.path.exists(self.token_path):
+            os.remove(self.token_path)
+
+
+class _TokenRefresher:
+    """
+    Refreshes OAuth credentials from a daemon thread before they expire, so
+    no request of a long run stalls on a 401 to refresh them.
+
+    The refresh goes through the credentials' store (serialized and
+    persisted). Credentials converted for other transports (mirrors) get the
+    new token as soon as it is obtained.
+    """
+
+    MIN_WAIT_SECONDS = 30
+    RETRY_SECONDS = 60
+
+    def __init__(self, credentials, margin_seconds: float = 300):
+        self.credentials = credentials
+        self.margin_seconds = margin_seconds
+        self.mirrors = []
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="d2b-token-refresh", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def add_mirror(self, mirror) -> None:
+        """Keeps a google-auth copy of the credentials on the current token."""
+        self.mirrors.append(mirror)
+        self._sync(mirror)
+
+    def seconds_until_refresh(self) -> float:
+        """Seconds until the token enters the refresh margin (0 when unknown)."""
+        if self.credentials.token_expiry is None:
+            return 0.0
+
+        # oauth2client keeps token_expiry as a naive UTC datetime
+        now = datetime.now(UTC).replace(tzinfo=None)
+        remaining = (self.credentials.token_expiry - now).total_seconds()
+
+        return max(0.0, remaining - self.margin_seconds)
+
+    def refresh(self) -> None:
+        self.credentials.refresh(httplib2.Http())
+
+        for mirror in self.mirrors:
+            self._sync(mirror)
+
+    def _sync(self, mirror) -> None:
+        mirror.token = self.credentials.access_token
+        mirror.expiry = self.credentials.token_expiry
+
+    def _run(self) -> None:
+        wait_seconds = self.seconds_until_refresh()
+
+        while not self._stop_event.wait(wait_seconds):
+            try:
+                self.refresh()
+            except Exception as error:
+                print(f"Background token refresh failed: {error}")
+                wait_seconds = self.RETRY_SECONDS
+                continue
+
+            wait_seconds = max(self.seconds_until_refresh(), self.MIN_WAIT_SECONDS)
+
+
 class Google_Token_MNG:
     """
     Manages authentication and creates authenticated Google API service objects.
@@ -25,8 +196,42 @@ class Google_Token_MNG:
     The resulting authenticated service can be retrieved through `get_service()`
     and reused by API wrapper classes such as Google_GA4 and
     GoogleSearchConsole.
+
+    Credentials are memoized per (client_secret, token, scopes, service
+    account) for the whole process. Services are backed by httplib2, which is
+    not thread-safe: `get_thread_service()` hands every thread its own service
+    built from the memoized credentials.
+
+    With the "session" transport, services send their requests through a
+    keep-alive requests session shared per credentials, with a configurable
+    connection pool size and gzip responses. `set_default_transport()`
+    switches every client of the process to it.
+
+    OAuth tokens loaded from disk are refreshed by a background thread
+    `refresh_margin_seconds` before they expire (None disables it). Refreshes
+    are serialized and written back to the token file atomically.
     """
 
+    _credentials_cache: dict[tuple, object] = {}
+    _credentials_lock = threading.Lock()
+    # One lock per configuration, so a slow load (interactive OAuth, ADC) only
+    # blocks the threads that wait for those same credentials.
+    _credentials_key_locks: dict[tuple, threading.Lock] = {}
+    _service_pool = threading.local()
+    # Bumped by clear_credentials_cache: pooled services of older generations are rebuilt
+    _credentials_generation = 0
+
+    TRANSPORTS = ("httplib2", "session")
+    default_transport = "httplib2"
+    default_pool_maxsize = 10
+    default_gzip = True
+
+    _sessions: dict[tuple, requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    refresh_margin_seconds: float | None = 300
+    _refreshers: dict[tuple, _TokenRefresher] = {}
+
     def __init__(
         self,
         client_secret: str | None,
@@ -35,6 +240,8 @@ class Google_Token_MNG:
         api_version: str,
         scopes: list[str] | None,
         use_service_account: bool = False,
+        transport: str | None = None,
+        pool_maxsize: int | None = None,
     ):
         self.scopes = scopes
         self.client_secret = client_secret
@@ -42,6 +249,11 @@ class Google_Token_MNG:
         self.api_name = api_name
         self.version = api_version
         self.use_sa = use_service_account
+        self.transport = transport or self.default_transport
+        self.pool_maxsize = pool_maxsize or self.default_pool_maxsize
+        if self.transport not in self.TRANSPORTS:
+            raise ValueError(f"transport must be one of {self.TRANSPORTS}")
+        self._owner_thread = threading.get_ident()
         self.service = self.create_api(
             api_name=self.api_name,
             api_version=self.version,
@@ -177,29 +389,23 @@ class Google_Token_MNG:
                 An authenticated Google API service object.
         """
 
-        if use_sa:
-            if secrets and os.path.exists(secrets):
-                creds = service_account.Credentials.from_service_account_file(
-                    secrets, scopes=scopes
-                )
-            else:
-                creds, project = google.auth.default(scopes=scopes)
-                print(f"Using ADC Credentials. Project detected: {project}")
+        if credentials and not use_sa and not scopes:
+            raise ValueError("scopes are required when using OAuth authentication.")
 
+        if self.transport == "session":
+            session_http = self._get_session_http(secrets, credentials, scopes, use_sa)
             return build(
-                api_name, api_version, credentials=creds, cache_discovery=False
+                api_name, api_version, http=session_http, cache_discovery=False
             )
 
-        if credentials:
-            if not scopes:
-                raise ValueError("scopes are required when using OAuth authentication.")
-
-            creds = self.get_credentials(
-                secrets=secrets,
-                credentials=credentials,
-                scopes=scopes,
+        if use_sa:
+            creds = self.get_cached_credentials(secrets, credentials, scopes, use_sa)
+            return build(
+                api_name, api_version, credentials=creds, cache_discovery=False
             )
 
+        if credentials:
+            creds = self.get_cached_credentials(secrets, credentials, scopes, use_sa)
             http_auth = creds.authorize(httplib2.Http())
 
             return build(
@@ -215,5 +421,305 @@ class Google_Token_MNG:
             cache_discovery=False,
         )
 
+    @classmethod
+    def set_default_transport(
+        cls,
+        transport: str = "session",
+        pool_maxsize: int = 10,
+        gzip: bool = True,
+    ) -> None:
+        """
+        Sets the transport used by every manager created afterwards, including
+        the ones created internally by Google_GA4, GoogleSearchConsole and
+        Google_Spreadsheet.
+
+        Args:
+            transport (str):
+                "httplib2" (one connection per service) or "session" (pooled
+                keep-alive requests session). Defaults to "session".
+
+            pool_maxsize (int):
+                Connections kept open per host by each session.
+
+            gzip (bool):
+                Whether to request gzip-compressed responses.
+
+        Raises:
+            ValueError:
+                If the transport is not supported.
+        """
+        if transport not in cls.TRANSPORTS:
+            raise ValueError(f"transport must be one of {cls.TRANSPORTS}")
+
+        cls.default_transport = transport
+        cls.default_pool_maxsize = pool_maxsize
+        cls.default_gzip = gzip
+
+    def _get_session_http(
+        self,
+        secrets: str | None,
+        credentials: str | None,
+        scopes: list[str] | None,
+        use_sa: bool = False,
+    ) -> _SessionHttp:
+        """
+        Returns an httplib2-compatible adapter over the pooled session of these
+        credentials, creating the session on first use.
+        """
+        key = self._credentials_key(secrets, credentials, scopes, use_sa)
+        key += (self.pool_maxsize, self.default_gzip)
+
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+
+        if session is not None:
+            return _SessionHttp(session, gzip=self.default_gzip)
+
+        # Credentials are loaded outside the lock: loading may wait on the user
+        google_creds = None
+
+        if use_sa:
+            google_creds = self.get_cached_credentials(
+                secrets, credentials, scopes, use_sa
+            )
+        elif credentials:
+            oauth_creds = self.get_cached_credentials(
+                secrets, credentials, scopes, use_sa
+            )
+            google_creds = self._to_google_auth_credentials(oauth_creds, scopes)
+
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+
+            if session is None:
+                if google_creds is not None and not use_sa:
+                    refresher = self._refreshers.get(
+                        self._credentials_key(secrets, credentials, scopes, use_sa)
+                    )
+                    if refresher is not None:
+                        refresher.add_mirror(google_creds)
+
+                session = (
+                    AuthorizedSession(google_creds)
+                    if google_creds is not None
+                    else requests.Session()
+                )
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_maxsize,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                self._sessions[key] = session
+
+        return _SessionHttp(session, gzip=self.default_gzip)
+
+    @staticmethod
+    def _to_google_auth_credentials(oauth_creds, scopes: list[str] | None):
+        """Converts oauth2client credentials so AuthorizedSession can refresh them."""
+        return google.oauth2.credentials.Credentials(
+            token=oauth_creds.access_token,
+            refresh_token=oauth_creds.refresh_token,
+            token_uri=oauth_creds.token_uri,
+            client_id=oauth_creds.client_id,
+            client_secret=oauth_creds.client_secret,
+            scopes=scopes,
+        )
+
+    def get_cached_credentials(
+        self,
+        secrets: str | None,
+        credentials: str | None,
+        scopes: list[str] | None,
+        use_sa: bool = False,
+    ):
+        """
+        Returns the credentials for this configuration, loading them only the
+        first time they are requested in the process.
+
+        Args:
+            secrets (str | None):
+                Client secret or Service Account key file.
+
+            credentials (str | None):
+                Path to the OAuth token file.
+
+            scopes (list[str] | None):
+                OAuth scopes required by the API.
+
+            use_sa (bool, optional):
+                Whether to use a Service Account or ADC. Defaults to False.
+
+        Returns:
+            Service Account / ADC credentials (google-auth) or OAuth
+            credentials (oauth2client).
+        """
+        key = self._credentials_key(secrets, credentials, scopes, use_sa)
+
+        with self._credentials_lock:
+            creds = self._credentials_cache.get(key)
+
+            if creds is not None:
+                return creds
+
+            key_lock = self._credentials_key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._credentials_lock:
+                creds = self._credentials_cache.get(key)
+
+            if creds is None:
+                creds = self._load_credentials(secrets, credentials, scopes, use_sa)
+
+                with self._credentials_lock:
+                    self._credentials_cache[key] = creds
+
+            return creds
+
+    def _load_credentials(
+        self,
+        secrets: str | None,
+        credentials: str | None,
+        scopes: list[str] | None,
+        use_sa: bool = False,
+    ):
+        """Loads the credentials of a Service Account, ADC or an OAuth token."""
+        if not use_sa:
+            creds = self.get_credentials(
+                secrets=secrets,
+                credentials=credentials,
+                scopes=scopes,
+            )
+
+            if isinstance(creds, client.OAuth2Credentials):
+                creds.set_store(_AtomicTokenStorage(credentials, self.open_json))
+
+                if self.refresh_margin_seconds is not None and creds.refresh_token:
+                    key = self._credentials_key(secrets, credentials, scopes, use_sa)
+                    refresher = _TokenRefresher(
+                        creds, margin_seconds=self.refresh_margin_seconds
+                    ).start()
+
+                    with self._credentials_lock:
+                        self._refreshers[key] = refresher
+
+            return creds
+
+        if secrets and os.path.exists(secrets):
+            return service_account.Credentials.from_service_account_file(
+                secrets, scopes=scopes
+            )
+
+        creds, project = google.auth.default(scopes=scopes)
+        print(f"Using ADC Credentials. Project detected: {project}")
+
+        return creds
+
+    @staticmethod
+    def _credentials_key(
+        secrets: str | None,
+        credentials: str | None,
+        scopes: list[str] | None,
+        use_sa: bool,
+    ) -> tuple:
+        return (secrets, credentials, tuple(scopes or ()), use_sa)
+
+    @classmethod
+    def clear_credentials_cache(cls) -> None:
+        """
+        Forgets the memoized credentials, e.g. after rotating a token file.
+
+        The pooled sessions are closed and every thread rebuilds its pooled
+        services on next use, so new managers and worker threads pick up the
+        new credentials. Managers created before keep their own `service`.
+        """
+        with cls._credentials_lock:
+            cls._credentials_cache.clear()
+            cls._credentials_generation += 1
+
+            for refresher in cls._refreshers.values():
+                refresher.stop()
+            cls._refreshers.clear()
+
+        with cls._sessions_lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+
+    def get_thread_service(self):
+        """
+        Returns a service that is safe to use from the calling thread.
+
+        The thread that created the manager gets `self.service`. Any other
+        thread gets its own service from the process-wide pool, built once per
+        thread from the memoized credentials.
+
+        Returns:
+            googleapiclient.discovery.Resource:
+                Service object owned by the calling thread.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self.service
+
+        return self.get_pooled_service(
+            client_secret=self.client_secret,
+            token=self.token,
+            api_name=self.api_name,
+            api_version=self.version,
+            scopes=self.scopes,
+            use_service_account=self.use_sa,
+            transport=self.transport,
+            pool_maxsize=self.pool_maxsize,
+        )
+
+    @classmethod
+    def get_pooled_service(
+        cls,
+        client_secret: str | None,
+        token: str | None,
+        api_name: str,
+        api_version: str,
+        scopes: list[str] | None,
+        use_service_account: bool = False,
+        transport: str | None = None,
+        pool_maxsize: int | None = None,
+    ):
+        """
+        Returns the calling thread's service for a configuration, creating it
+        on first use. Services are never shared between threads.
+
+        Returns:
+            googleapiclient.discovery.Resource:
+                Service object owned by the calling thread.
+        """
+        key = cls._credentials_key(client_secret, token, scopes, use_service_account)
+        key += (api_name, api_version, transport, pool_maxsize)
+
+        services = getattr(cls._service_pool, "services", None)
+
+        if (
+            services is None
+            or getattr(cls._service_pool, "generation", None)
+            != cls._credentials_generation
+        ):
+            services = cls._service_pool.services = {}
+            cls._service_pool.generation = cls._credentials_generation
+
+        service = services.get(key)
+
+        if service is None:
+            service = cls(
+                client_secret=client_secret,
+                token=token,
+                api_name=api_name,
+                api_version=api_version,
+                scopes=scopes,
+                use_service_account=use_service_account,
+                transport=transport,
+                pool_maxsize=pool_maxsize,
+            ).get_service()
+            services[key] = service
+
+        return service
+
     def get_service(self):
         return self.service
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+
+class DiskCache:
+    """
+    Persistent on-disk cache of JSON-serializable payloads.
+
+    Every entry is stored gzip-compressed in its own file, named after the
+    hash of its key, so the cache can be shared by several processes and
+    survives between runs. Entries are evicted by age and, when a size limit
+    is configured, oldest first until the directory fits in it.
+    """
+
+    FILE_SUFFIX: str = ".json.gz"
+
+    def __init__(
+        self,
+        directory: str,
+        max_age_seconds: float | None = None,
+        max_size_bytes: int | None = None,
+    ) -> None:
+        """
+        Initializes the cache directory.
+
+        Args:
+            directory:
+                Folder where the entries are stored. Created if missing.
+            max_age_seconds:
+                Entries older than this are discarded. None keeps them forever.
+            max_size_bytes:
+                Maximum total size of the stored entries. None means unbounded.
+        """
+        self.directory: str = os.path.expanduser(directory)
+        self.max_age_seconds: float | None = max_age_seconds
+        self.max_size_bytes: int | None = max_size_bytes
+        self._lock: threading.Lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._size_bytes: int = 0
+        self.evict()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Builds a stable cache key from JSON-serializable parts.
+
+        Dictionaries are serialized with sorted keys, so two queries that
+        only differ in key order share the same entry.
+
+        Returns:
+            Hex digest identifying the entry.
+        """
+        serialized: str = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Returns the payload stored under key.
+
+        Returns:
+            Stored payload, or None when missing, expired or unreadable.
+        """
+        path: str = self._path(key)
+
+        try:
+            modified_at: float = os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+
+        if self._is_expired(modified_at):
+            self._remove(path)
+            return None
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            self._remove(path)
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores value under key, replacing any previous entry atomically.
+        """
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory,
+            suffix=".tmp",
+        )
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as raw_file:
+                with gzip.GzipFile(fileobj=raw_file, mode="wb") as file:
+                    file.write(json.dumps(value).encode("utf-8"))
+
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+
+        with self._lock:
+            self._size_bytes += os.path.getsize(self._path(key))
+            over_limit: bool = (
+                self.max_size_bytes is not None
+                and self._size_bytes > self.max_size_bytes
+            )
+
+        if over_limit:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under key, if any.
+        """
+        self._remove(self._path(key))
+
+    def clear(self) -> None:
+        """
+        Removes every entry of the cache.
+        """
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+        with self._lock:
+            self._size_bytes = 0
+
+    def evict(self) -> None:
+        """
+        Removes expired entries and, if a size limit is set, the oldest
+        entries until the cache fits in it.
+        """
+        with self._lock:
+            entries: list[tuple[str, float, int]] = []
+
+            for path, modified_at, size in self._entries():
+                if self._is_expired(modified_at):
+                    self._remove(path)
+                else:
+                    entries.append((path, modified_at, size))
+
+            total_size: int = sum(size for _, _, size in entries)
+
+            if self.max_size_bytes is not None:
+                entries.sort(key=lambda entry: entry[1])
+
+                while entries and total_size > self.max_size_bytes:
+                    path, _, size = entries.pop(0)
+                    self._remove(path)
+                    total_size -= size
+
+            self._size_bytes = total_size
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        entries: list[tuple[str, float, int]] = []
+
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.FILE_SUFFIX):
+                continue
+
+            path: str = os.path.join(self.directory, name)
+
+            try:
+                stat: os.stat_result = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            entries.append((path, stat.st_mtime, stat.st_size))
+
+        return entries
+
+    def _is_expired(self, modified_at: float) -> bool:
+        if self.max_age_seconds is None:
+            return False
+
+        return time.time() - modified_at > self.max_age_seconds
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.FILE_SUFFIX}")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import contextvars
 import copy
+import json
 import logging
+import os
 import random
+import threading
 import time
-from datetime import UTC, datetime
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from typing import Any
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
 import d2b_data.Google_Token_MNG
+from d2b_data.disk_cache import DiskCache
 from d2b_data.workflow_logger import WorkflowLogger
 
+# Caps the API calls in flight of one get_report_df_many call. It is a context
+# variable so concurrent calls keep their own cap; pools copy it into workers.
+_request_slots: contextvars.ContextVar[threading.BoundedSemaphore | None] = (
+    contextvars.ContextVar("gsc_request_slots", default=None)
+)
+
 
 class GoogleSearchConsole:
     """
@@ -23,6 +39,21 @@ class GoogleSearchConsole:
     report execution, pagination and response conversion to pandas DataFrames.
     """
 
+    DEVICES: tuple[str, ...] = ("DESKTOP", "MOBILE", "TABLET")
+    RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    # Dimensions that repeat the same strings across rows, kept as categoricals.
+    CATEGORICAL_DIMENSIONS: frozenset[str] = frozenset(
+        {"query", "page", "country", "device", "searchAppearance"}
+    )
+    # Search Console days and hours follow Pacific Time.
+    HOURLY_TIMEZONE: str = "America/Los_Angeles"
+    METRIC_DTYPES: dict[str, str] = {
+        "clicks": "int32",
+        "impressions": "int32",
+        "ctr": "float32",
+        "position": "float32",
+    }
+
     def __init__(
         self,
         client_secret: str | None = None,
@@ -31,6 +62,11 @@ class GoogleSearchConsole:
         auto_paginate: bool = True,
         row_limit: int = 25_000,
         use_service_account: bool = False,
+        max_workers: int = 1,
+        split_by_day: bool = False,
+        prefetch_pages: int = 0,
+        response_cache: DiskCache | None = None,
+        cache_mutable_days: int = 5,
     ) -> None:
         """
 
@@ -49,6 +85,21 @@ class GoogleSearchConsole:
                 Maximum number of rows requested per API call.
             use_service_account:
                 Indicates whether Service Account authentication should be used.
+            max_workers:
+                Number of report slices requested concurrently. 1 keeps the
+                extraction sequential.
+            split_by_day:
+                Requests every day of the range as its own query, so each day
+                gets the full per-query row cap.
+            prefetch_pages:
+                Pages requested ahead of the one being read during pagination.
+                0 waits for every page before requesting the next one.
+            response_cache:
+                Optional DiskCache for final days. When set, reports are
+                requested day by day and final days are served from it.
+            cache_mutable_days:
+                Days before today (Pacific Time) that are never cached, as
+                final data can still change during that window.
         """
         self.default_api_name: str = "searchconsole"
         self.default_version: str = "v1"
@@ -57,6 +108,15 @@ class GoogleSearchConsole:
         self.auto_paginate: bool = auto_paginate
         self.row_limit: int = row_limit
         self.use_service_account: bool = use_service_account
+        self.max_workers: int = max_workers
+        self.split_by_day: bool = split_by_day
+        self.prefetch_pages: int = prefetch_pages
+        self.response_cache: DiskCache | None = response_cache
+        self.cache_mutable_days: int = cache_mutable_days
+        self._hourly_state: dict[str, dict[str, str]] = {}
+        # httplib2 is not thread-safe: every pool worker gets its own service.
+        self._owner_thread: int = threading.get_ident()
+        self._token_mng: d2b_data.Google_Token_MNG.Google_Token_MNG | None = None
         self.logger: WorkflowLogger = verbose_logger or self._build_default_logger()
 
         self.logger.info(
@@ -109,6 +169,29 @@ class GoogleSearchConsole:
 
         return self.auto_paginate
 
+    def set_max_workers(
+        self,
+        max_workers: int = 1,
+    ) -> int:
+        """
+        Sets how many report slices are requested concurrently.
+        Args:
+            max_workers:
+                Number of worker threads. 1 keeps the extraction sequential.
+        Returns:
+            Current number of workers.
+        Raises:
+            ValueError:
+                If max_workers is not a positive integer.
+        """
+        if not isinstance(max_workers, int) or max_workers < 1:
+            self.logger.critical("max_workers must be a positive integer")
+            raise ValueError("max_workers must be a positive integer")
+
+        self.max_workers = max_workers
+
+        return self.max_workers
+
     def create_service(
         self,
         secrets: str | None,
@@ -140,11 +223,28 @@ class GoogleSearchConsole:
         )
 
         service: Resource = token_mng.get_service()
+        self._token_mng = token_mng
 
         self.logger.info("Connected to Google Search Console")
 
         return service
 
+    def _get_thread_service(self) -> Resource:
+        """
+        Returns the service object owned by the calling thread.
+
+        The thread that created the instance uses self.service; pool workers
+        get their own from the token manager's per-thread pool, built from
+        the memoized credentials, because httplib2 is not thread-safe.
+
+        Returns:
+            Authenticated Search Console API resource.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self.service
+
+        return self._token_mng.get_thread_service()
+
     def get_report_df(
         self,
         property_uri: str,
@@ -152,8 +252,9 @@ class GoogleSearchConsole:
         end_date: str,
         dimensions: list[str],
         dimension_filter_groups: list[dict[str, Any]] | None = None,
-        search_type: str = "web",
+        search_type: str | list[str] = "web",
         data_state: str = "final",
+        split_by_device: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieves a Search Console report as a pandas DataFrame.
@@ -171,9 +272,14 @@ class GoogleSearchConsole:
             dimension_filter_groups:
                 Optional Search Console dimension filters.
             search_type:
-                Search type, such as web, image, video or news.
+                Search type, such as web, image, video or news. A list of
+                search types is fetched as one slice per type and adds a
+                "search_type" column.
             data_state:
                 Data state requested from Search Console.
+            split_by_device:
+                Fetches every device as its own slice (a device filter) and
+                adds "device" to the dimensions if missing.
 
         Returns:
             Search Console report as a pandas DataFrame.
@@ -190,15 +296,403 @@ class GoogleSearchConsole:
         if "date" not in report_dimensions:
             report_dimensions.append("date")
 
+        if split_by_device and "device" not in report_dimensions:
+            report_dimensions.append("device")
+
+        search_types: list[str] = (
+            [search_type] if isinstance(search_type, str) else list(search_type)
+        )
+
+        if (
+            self.split_by_day
+            or self.response_cache is not None
+            or split_by_device
+            or len(search_types) > 1
+        ):
+            return self._get_sliced_report(
+                property_uri=property_uri,
+                start_date=start_date,
+                end_date=end_date,
+                dimensions=report_dimensions,
+                dimension_filter_groups=dimension_filter_groups,
+                search_types=search_types,
+                data_state=data_state,
+                split_by_device=split_by_device,
+            )
+
         query: dict[str, Any] = self._create_query(
             start_date=start_date,
             end_date=end_date,
             dimensions=report_dimensions,
             dimension_filter_groups=dimension_filter_groups,
-            search_type=search_type,
+            search_type=search_types[0],
             data_state=data_state,
         )
 
+        return self._get_query_df(
+            property_uri=property_uri,
+            query=query,
+            dimensions=report_dimensions,
+        )
+
+    def get_report_df_many(
+        self,
+        property_uris: list[str],
+        start_date: str,
+        end_date: str,
+        dimensions: list[str],
+        dimension_filter_groups: list[dict[str, Any]] | None = None,
+        search_type: str | list[str] = "web",
+        data_state: str = "final",
+        split_by_device: bool = False,
+        max_property_workers: int = 4,
+        max_concurrent_requests: int | None = None,
+        property_retries: int = 2,
+    ) -> tuple[pd.DataFrame, dict[str, dict[str, Any]]]:
+        """
+        Runs the same report against several properties concurrently.
+
+        Every property reuses this instance's credentials and settings, and
+        its rows are tagged in a "property_uri" column. A property that keeps
+        failing with a retryable error after the request retries is backed
+        off and retried as a whole, up to property_retries times. A failing
+        property does not abort the others.
+
+        Args:
+            property_uris:
+                Search Console property URIs.
+            start_date:
+                Report start date in YYYY-MM-DD format.
+            end_date:
+                Report end date in YYYY-MM-DD format.
+            dimensions:
+                Dimensions included in the report.
+            dimension_filter_groups:
+                Optional Search Console dimension filters.
+            search_type:
+                Search type or list of search types.
+            data_state:
+                Data state requested from Search Console.
+            split_by_device:
+                Fetches every device as its own slice.
+            max_property_workers:
+                Number of properties processed concurrently.
+            max_concurrent_requests:
+                Global cap of API calls in flight, across properties, slices
+                and prefetched pages. None leaves it uncapped.
+            property_retries:
+                Times a property is retried after a retryable error.
+
+        Returns:
+            Tuple with the concatenated report and the status of every
+            property: {"status": "ok", "rows": n, "attempts": k} or
+            {"status": "error", "error": message, "attempts": k}.
+        """
+
+        slots: threading.BoundedSemaphore | None = (
+            threading.BoundedSemaphore(max_concurrent_requests)
+            if max_concurrent_requests is not None
+            else None
+        )
+
+        def fetch_property(
+            property_uri: str,
+        ) -> tuple[str, pd.DataFrame | None, Exception | None, int]:
+            _request_slots.set(slots)
+            attempt: int = 0
+
+            while True:
+                attempt += 1
+
+                try:
+                    property_df: pd.DataFrame = self.get_report_df(
+                        property_uri=property_uri,
+                        start_date=start_date,
+                        end_date=end_date,
+                        dimensions=dimensions,
+                        dimension_filter_groups=dimension_filter_groups,
+                        search_type=search_type,
+                        data_state=data_state,
+                        split_by_device=split_by_device,
+                    )
+                except HttpError as error:
+                    if (
+                        error.resp.status not in self.RETRYABLE_STATUS_CODES
+                        or attempt > property_retries
+                    ):
+                        self.logger.error(f"{property_uri} failed: {error}")
+                        return property_uri, None, error, attempt
+
+                    sleep_time: float = (2**attempt) * 10 + random.uniform(0, 5)
+
+                    self.logger.info(
+                        f"{property_uri}: error {error.resp.status}. "
+                        f"Retrying the property in {sleep_time:.2f} seconds."
+                    )
+
+                    time.sleep(sleep_time)
+                    continue
+                except Exception as error:
+                    self.logger.error(f"{property_uri} failed: {error}")
+                    return property_uri, None, error, attempt
+
+                property_df.insert(
+                    0,
+                    "property_uri",
+                    pd.Categorical([property_uri] * len(property_df)),
+                )
+
+                return property_uri, property_df, None, attempt
+
+        all_dataframes: list[pd.DataFrame] = []
+        status: dict[str, dict[str, Any]] = {}
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max(1, max_property_workers)
+        )
+
+        try:
+            # Each property runs in a copy of this context, so the cap set by
+            # fetch_property stays within this call.
+            for property_uri, property_df, error, attempts in executor.map(
+                lambda property_uri: contextvars.copy_context().run(
+                    fetch_property, property_uri
+                ),
+                property_uris,
+            ):
+                if error is not None:
+                    status[property_uri] = {
+                        "status": "error",
+                        "error": str(error),
+                        "attempts": attempts,
+                    }
+                    continue
+
+                status[property_uri] = {
+                    "status": "ok",
+                    "rows": len(property_df),
+                    "attempts": attempts,
+                }
+
+                if not property_df.empty:
+                    all_dataframes.append(property_df)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        failed: int = sum(
+            1 for result in status.values() if result["status"] == "error"
+        )
+
+        self.logger.info(f"Properties: {len(status) - failed} ok, {failed} failed")
+
+        if not all_dataframes:
+            return pd.DataFrame(), status
+
+        return self._concat_frames(all_dataframes), status
+
+    def get_hourly_delta(
+        self,
+        property_uri: str,
+        dimensions: list[str],
+        dimension_filter_groups: list[dict[str, Any]] | None = None,
+        search_type: str = "web",
+        state_file: str | None = None,
+        lookback_days: int = 1,
+    ) -> pd.DataFrame:
+        """
+        Retrieves the hourly rows that are new since the previous call.
+
+        Queries the hour dimension with the hourly_all data state, from the
+        day of the last complete hour emitted (the watermark) to today, and
+        returns only the rows after it. Hours still incomplete according to
+        metadata.firstIncompleteHour are returned again on the next calls
+        until they are complete, so callers should upsert by hour.
+
+        The watermark is kept in memory for this instance or, with
+        state_file, in a JSON file shared between runs.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            dimensions:
+                Dimensions included in the report. "hour" is added if missing.
+            dimension_filter_groups:
+                Optional Search Console dimension filters.
+            search_type:
+                Search type, such as web, image, video or news.
+            state_file:
+                Optional JSON file where the watermarks are persisted.
+            lookback_days:
+                Days before today requested when there is no watermark yet.
+
+        Returns:
+            Rows of the hours after the watermark.
+        """
+        report_dimensions: list[str] = dimensions.copy()
+
+        if "hour" not in report_dimensions:
+            report_dimensions.append("hour")
+
+        state_key: str = DiskCache.make_key(
+            property_uri,
+            report_dimensions,
+            dimension_filter_groups,
+            search_type,
+        )
+        state: dict[str, dict[str, str]] = (
+            self._load_hourly_state(state_file) if state_file else self._hourly_state
+        )
+        watermark: str | None = state.get(state_key, {}).get("watermark")
+
+        timezone: ZoneInfo = ZoneInfo(self.HOURLY_TIMEZONE)
+        end_date: str = datetime.now(timezone).date().isoformat()
+
+        if watermark:
+            start_date: str = (
+                pd.Timestamp(watermark).tz_convert(timezone).date().isoformat()
+            )
+        else:
+            start_date = (
+                datetime.now(timezone).date() - timedelta(days=lookback_days)
+            ).isoformat()
+
+        self._validate_report_parameters(
+            property_uri=property_uri,
+            start_date=start_date,
+            end_date=end_date,
+            dimensions=report_dimensions,
+        )
+
+        query: dict[str, Any] = self._create_query(
+            start_date=start_date,
+            end_date=end_date,
+            dimensions=report_dimensions,
+            dimension_filter_groups=dimension_filter_groups,
+            search_type=search_type,
+            data_state="hourly_all",
+        )
+
+        if self.auto_paginate:
+            response: dict[str, Any] = self._get_all_rows(
+                property_uri=property_uri,
+                query=query,
+            )
+        else:
+            response = self._get_report_raw(
+                property_uri=property_uri,
+                query=query,
+            )
+
+        hourly_df: pd.DataFrame = self._to_df(
+            raw_server_response=response,
+            dimensions=report_dimensions,
+        )
+        hours: pd.Series = pd.to_datetime(hourly_df["hour"], utc=True)
+
+        if watermark:
+            is_new: pd.Series = hours > pd.Timestamp(watermark)
+            delta_df: pd.DataFrame = hourly_df[is_new].reset_index(drop=True)
+        else:
+            delta_df = hourly_df
+
+        first_incomplete_hour: str | None = (
+            response.get("metadata") or {}
+        ).get("firstIncompleteHour")
+
+        if first_incomplete_hour:
+            hours = hours[hours < pd.Timestamp(first_incomplete_hour)]
+
+        if not hours.empty and (
+            not watermark or hours.max() > pd.Timestamp(watermark)
+        ):
+            if state_file:
+                # Re-read the state in case another process updated another key.
+                state = self._load_hourly_state(state_file)
+
+            state[state_key] = {
+                "property_uri": property_uri,
+                "watermark": hours.max().isoformat(),
+                "updated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            }
+
+            if state_file:
+                self._save_hourly_state(state_file, state)
+
+        self.logger.info(
+            f"Hourly delta: {len(delta_df)} rows after {watermark or 'first run'}"
+        )
+
+        return delta_df
+
+    @staticmethod
+    def _load_hourly_state(state_file: str) -> dict[str, dict[str, str]]:
+        """
+        Reads the hourly watermark file.
+
+        Args:
+            state_file:
+                JSON state file. A missing file is an empty state.
+
+        Returns:
+            Watermarks by state key.
+        """
+        if not os.path.isfile(state_file):
+            return {}
+
+        with open(state_file, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _save_hourly_state(
+        state_file: str,
+        state: dict[str, dict[str, str]],
+    ) -> None:
+        """
+        Writes the hourly watermark file atomically.
+
+        Args:
+            state_file:
+                JSON state file.
+            state:
+                Watermarks by state key.
+        """
+        temp_file: str = f"{state_file}.tmp"
+
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+
+        os.replace(temp_file, state_file)
+
+    def _get_query_df(
+        self,
+        property_uri: str,
+        query: dict[str, Any],
+        dimensions: list[str],
+    ) -> pd.DataFrame:
+        """
+        Runs one query, paginated or not depending on auto_paginate.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            query:
+                Search Console request body.
+            dimensions:
+                Dimensions included in the report.
+
+        Returns:
+            Search Console report as a pandas DataFrame.
+        """
+        cache_key: str | None = self._cache_key(property_uri, query)
+
+        if cache_key is not None:
+            return self._get_cached_day_df(
+                property_uri=property_uri,
+                query=query,
+                dimensions=dimensions,
+                cache_key=cache_key,
+            )
+
         if not self.auto_paginate:
             response: dict[str, Any] = self._get_report_raw(
                 property_uri=property_uri,
@@ -207,15 +701,414 @@ class GoogleSearchConsole:
 
             return self._to_df(
                 raw_server_response=response,
-                dimensions=report_dimensions,
+                dimensions=dimensions,
             )
 
         return self._get_paginated_report(
             property_uri=property_uri,
             query=query,
-            dimensions=report_dimensions,
+            dimensions=dimensions,
+        )
+
+    def _get_cached_day_df(
+        self,
+        property_uri: str,
+        query: dict[str, Any],
+        dimensions: list[str],
+        cache_key: str,
+    ) -> pd.DataFrame:
+        """
+        Serves a single-day query from response_cache, or fetches it.
+
+        Only final days with rows are stored, so fresh (or not yet processed)
+        days are requested again on every run until they become final and
+        replace the fresh rows.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            query:
+                Single-day Search Console request body.
+            dimensions:
+                Dimensions included in the report.
+            cache_key:
+                Key of the day in response_cache.
+
+        Returns:
+            Search Console report as a pandas DataFrame.
+        """
+        cached: dict[str, Any] | None = self.response_cache.get(cache_key)
+
+        # Entries cached under a shorter cache_mutable_days are not trusted
+        if cached is not None and self._is_final_day(
+            query["startDate"],
+            cached.get("metadata"),
+        ):
+            self.logger.debug(f"Day {query['startDate']} served from cache")
+
+            return self._to_df(
+                raw_server_response=cached,
+                dimensions=dimensions,
+            )
+
+        if self.auto_paginate:
+            response: dict[str, Any] = self._get_all_rows(
+                property_uri=property_uri,
+                query=query,
+            )
+        else:
+            response = self._get_report_raw(
+                property_uri=property_uri,
+                query=query,
+            )
+
+        # A day without rows may simply not be processed yet: it is never cached
+        if response.get("rows") and self._is_final_day(
+            query["startDate"],
+            response.get("metadata"),
+        ):
+            self.response_cache.set(cache_key, response)
+
+        return self._to_df(
+            raw_server_response=response,
+            dimensions=dimensions,
+        )
+
+    def _get_all_rows(
+        self,
+        property_uri: str,
+        query: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Paginates a query and merges its pages into one raw response.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            query:
+                Search Console request body.
+
+        Returns:
+            Raw response holding the rows of every page and the metadata of
+            the last one.
+        """
+        merged: dict[str, Any] = {"rows": []}
+        pages: Iterator[dict[str, Any]] = self._iter_pages(
+            property_uri=property_uri,
+            query=query,
         )
 
+        try:
+            for response in pages:
+                page_rows: list[dict[str, Any]] = response.get("rows", [])
+                merged["rows"].extend(page_rows)
+
+                if "metadata" in response:
+                    merged["metadata"] = response["metadata"]
+
+                if len(page_rows) < self.row_limit:
+                    break
+        finally:
+            pages.close()
+
+        return merged
+
+    def _cache_key(
+        self,
+        property_uri: str,
+        query: dict[str, Any],
+    ) -> str | None:
+        """
+        Returns the response_cache key of a single-day query.
+
+        The key covers the property, dimensions, filters, search type, data
+        state and day of the query, and the pagination mode: a day fetched
+        without auto_paginate only holds its first rowLimit rows.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            query:
+                Search Console request body.
+
+        Returns:
+            Cache key, or None without response_cache or for multi-day queries.
+        """
+        if self.response_cache is None:
+            return None
+
+        if query.get("startDate") != query.get("endDate"):
+            return None
+
+        normalized_query: dict[str, Any] = {
+            key: value
+            for key, value in query.items()
+            if key not in ("startDate", "endDate", "startRow", "rowLimit")
+        }
+        rows: int | str = (
+            "all" if self.auto_paginate else query.get("rowLimit", self.row_limit)
+        )
+
+        return DiskCache.make_key(
+            property_uri,
+            normalized_query,
+            query["startDate"],
+            rows,
+        )
+
+    def _is_final_day(
+        self,
+        day: str,
+        metadata: dict[str, Any] | None,
+    ) -> bool:
+        """
+        Tells whether a day's data is final and can be cached permanently.
+
+        The last cache_mutable_days days (in Pacific Time, as Search Console
+        days) are treated as still changing: final data often lags 2-3 days.
+        Responses with fresh data also carry metadata.firstIncompleteDate, and
+        no day from it onwards is final.
+
+        Args:
+            day:
+                Day in YYYY-MM-DD format.
+            metadata:
+                Metadata of the day's response, if any.
+
+        Returns:
+            True when the day can be cached.
+        """
+        last_final_day: str = (
+            datetime.now(ZoneInfo(self.HOURLY_TIMEZONE)).date()
+            - timedelta(days=self.cache_mutable_days)
+        ).isoformat()
+
+        if day > last_final_day:
+            return False
+
+        first_incomplete_date: str | None = (metadata or {}).get("firstIncompleteDate")
+
+        return not first_incomplete_date or day < first_incomplete_date
+
+    def _get_sliced_report(
+        self,
+        property_uri: str,
+        start_date: str,
+        end_date: str,
+        dimensions: list[str],
+        dimension_filter_groups: list[dict[str, Any]] | None,
+        search_types: list[str],
+        data_state: str,
+        split_by_device: bool,
+    ) -> pd.DataFrame:
+        """
+        Splits the report by day (split_by_day), search type and device, runs
+        the slices through the worker pool and concatenates them in order.
+
+        Search Console caps the rows returned per query, so every slice gets
+        its own cap.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            start_date:
+                Report start date.
+            end_date:
+                Report end date.
+            dimensions:
+                Dimensions included in the report.
+            dimension_filter_groups:
+                Optional dimension filters.
+            search_types:
+                Search types requested, one slice each.
+            data_state:
+                Requested data state.
+            split_by_device:
+                Whether every device is requested as its own slice.
+
+        Returns:
+            Search Console report as a pandas DataFrame.
+        """
+        if self.split_by_day or self.response_cache is not None:
+            date_ranges: list[tuple[str, str]] = [
+                (day, day) for day in self._days_between(start_date, end_date)
+            ]
+        else:
+            date_ranges = [(start_date, end_date)]
+
+        devices: tuple[str | None, ...] = self.DEVICES if split_by_device else (None,)
+        tag_search_type: bool = len(search_types) > 1
+
+        slices: list[tuple[str, str, str, str | None]] = [
+            (slice_start, slice_end, slice_type, device)
+            for slice_start, slice_end in date_ranges
+            for slice_type in search_types
+            for device in devices
+        ]
+
+        self.logger.info(f"Querying {len(slices)} slices with {self.max_workers} workers")
+
+        def fetch_slice(report_slice: tuple[str, str, str, str | None]) -> pd.DataFrame:
+            slice_start, slice_end, slice_type, device = report_slice
+
+            query: dict[str, Any] = self._create_query(
+                start_date=slice_start,
+                end_date=slice_end,
+                dimensions=dimensions,
+                dimension_filter_groups=self._add_device_filter(
+                    dimension_filter_groups,
+                    device,
+                ),
+                search_type=slice_type,
+                data_state=data_state,
+            )
+
+            slice_df: pd.DataFrame = self._get_query_df(
+                property_uri=property_uri,
+                query=query,
+                dimensions=dimensions,
+            )
+
+            if tag_search_type:
+                slice_df["search_type"] = slice_type
+
+            return slice_df
+
+        all_dataframes: list[pd.DataFrame] = [
+            slice_df
+            for slice_df in self._map_concurrent(fetch_slice, slices)
+            if not slice_df.empty
+        ]
+
+        if not all_dataframes:
+            empty_df: pd.DataFrame = self._empty_df(dimensions)
+
+            if tag_search_type:
+                empty_df["search_type"] = pd.Series(dtype=object)
+
+            return empty_df
+
+        result_df: pd.DataFrame = self._concat_frames(all_dataframes)
+
+        self.logger.info(f"Total rows obtained: {len(result_df)}")
+
+        return result_df
+
+    def _add_device_filter(
+        self,
+        dimension_filter_groups: list[dict[str, Any]] | None,
+        device: str | None,
+    ) -> list[dict[str, Any]] | None:
+        """
+        Restricts the filter groups to one device.
+
+        The device filter is added to every group, so it applies however the
+        groups are combined.
+
+        Args:
+            dimension_filter_groups:
+                Optional dimension filters.
+            device:
+                Device to keep, or None to leave the filters untouched.
+
+        Returns:
+            Filter groups including the device filter.
+        """
+        if device is None:
+            return dimension_filter_groups
+
+        device_filter: dict[str, str] = {
+            "dimension": "device",
+            "operator": "equals",
+            "expression": device,
+        }
+
+        if not dimension_filter_groups:
+            return [{"groupType": "and", "filters": [device_filter]}]
+
+        filter_groups: list[dict[str, Any]] = copy.deepcopy(dimension_filter_groups)
+
+        for group in filter_groups:
+            group["filters"] = group.get("filters", []) + [device_filter]
+
+        return filter_groups
+
+    @staticmethod
+    def _days_between(
+        start_date: str,
+        end_date: str,
+    ) -> list[str]:
+        """
+        Lists every day between two dates, both included.
+
+        Args:
+            start_date:
+                First day in YYYY-MM-DD format.
+            end_date:
+                Last day in YYYY-MM-DD format.
+
+        Returns:
+            Days in YYYY-MM-DD format.
+        """
+        start: datetime = datetime.strptime(start_date, "%Y-%m-%d")
+        end: datetime = datetime.strptime(end_date, "%Y-%m-%d")
+
+        return [
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+            for offset in range((end - start).days + 1)
+        ]
+
+    def _map_concurrent(
+        self,
+        func: Callable[[Any], Any],
+        items: list[Any],
+    ) -> Iterator[Any]:
+        """
+        Applies func to every item, through a thread pool when max_workers > 1.
+
+        Results are yielded in the same order as items, with at most
+        2 * max_workers items in flight.
+
+        Args:
+            func:
+                Function applied to each item.
+            items:
+                Items to process.
+
+        Returns:
+            Iterator over the results, in order.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.max_workers)
+        in_flight: deque = deque()
+        pending_items: Iterator[Any] = iter(items)
+        context: contextvars.Context = contextvars.copy_context()
+
+        def run(item: Any) -> Any:
+            return context.copy().run(func, item)
+
+        try:
+            for item in pending_items:
+                in_flight.append(executor.submit(run, item))
+
+                if len(in_flight) >= 2 * self.max_workers:
+                    break
+
+            while in_flight:
+                result: Any = in_flight.popleft().result()
+
+                for item in pending_items:
+                    in_flight.append(executor.submit(run, item))
+                    break
+
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _create_query(
         self,
         start_date: str,
@@ -281,17 +1174,26 @@ class GoogleSearchConsole:
         """
         max_retries: int = 5
         retry_count: int = 0
+        slots: threading.BoundedSemaphore | None = _request_slots.get()
 
         while True:
             try:
-                response: dict[str, Any] = (
-                    self.service.searchanalytics()
-                    .query(
-                        siteUrl=property_uri,
-                        body=query,
+                if slots is not None:
+                    slots.acquire()
+
+                try:
+                    response: dict[str, Any] = (
+                        self._get_thread_service()
+                        .searchanalytics()
+                        .query(
+                            siteUrl=property_uri,
+                            body=query,
+                        )
+                        .execute()
                     )
-                    .execute()
-                )
+                finally:
+                    if slots is not None:
+                        slots.release()
 
                 return response
 
@@ -299,7 +1201,7 @@ class GoogleSearchConsole:
                 status_code: int = error.resp.status
                 reason: str = error._get_reason()
 
-                if status_code not in {429, 500, 502, 503, 504}:
+                if status_code not in self.RETRYABLE_STATUS_CODES:
                     self.logger.critical(
                         f"Non-recoverable error {status_code}: {reason}"
                     )
@@ -345,9 +1247,64 @@ class GoogleSearchConsole:
             Complete Search Console report as a pandas DataFrame.
         """
         all_dataframes: list[pd.DataFrame] = []
-        start_row: int = 0
 
-        while True:
+        pages: Iterator[dict[str, Any]] = self._iter_pages(
+            property_uri=property_uri,
+            query=query,
+        )
+
+        try:
+            for response in pages:
+                page_df: pd.DataFrame = self._to_df(
+                    raw_server_response=response,
+                    dimensions=dimensions,
+                )
+
+                if page_df.empty:
+                    break
+
+                all_dataframes.append(page_df)
+
+                if len(page_df) < self.row_limit:
+                    break
+        finally:
+            pages.close()
+
+        if not all_dataframes:
+            self.logger.info("No data found for the specified period.")
+            return self._empty_df(dimensions)
+
+        result_df: pd.DataFrame = self._concat_frames(all_dataframes)
+
+        self.logger.info(f"Total rows obtained: {len(result_df)}")
+
+        return result_df
+
+    def _iter_pages(
+        self,
+        property_uri: str,
+        query: dict[str, Any],
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yields the raw responses of a query's pages in startRow order.
+
+        With prefetch_pages > 0 the following pages are requested while the
+        current one is read, through a pool of prefetch_pages + 1 threads that
+        lives for this call. Pages still pending when the caller stops (at the
+        first short page) are cancelled, and the ones already running are
+        discarded: the pool is shut down without waiting for them.
+
+        Args:
+            property_uri:
+                Search Console property URI.
+            query:
+                Search Console request body.
+
+        Returns:
+            Iterator over the raw page responses.
+        """
+
+        def fetch_page(start_row: int) -> dict[str, Any]:
             paginated_query: dict[str, Any] = copy.deepcopy(query)
             paginated_query["startRow"] = start_row
             paginated_query["rowLimit"] = self.row_limit
@@ -356,40 +1313,38 @@ class GoogleSearchConsole:
                 f"Querying from row {start_row} with limit {self.row_limit}"
             )
 
-            response: dict[str, Any] = self._get_report_raw(
+            return self._get_report_raw(
                 property_uri=property_uri,
                 query=paginated_query,
             )
 
-            page_df: pd.DataFrame = self._to_df(
-                raw_server_response=response,
-                dimensions=dimensions,
-            )
-
-            if page_df.empty:
-                break
-
-            all_dataframes.append(page_df)
-
-            rows_received: int = len(page_df)
+        if self.prefetch_pages <= 0:
+            start_row: int = 0
 
-            if rows_received < self.row_limit:
-                break
+            while True:
+                yield fetch_page(start_row)
+                start_row += self.row_limit
 
-            start_row += self.row_limit
-
-        if not all_dataframes:
-            self.logger.info("No data found for the specified period.")
-            return self._empty_df(dimensions)
-
-        result_df: pd.DataFrame = pd.concat(
-            all_dataframes,
-            ignore_index=True,
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.prefetch_pages + 1,
+            thread_name_prefix="gsc-page",
         )
+        in_flight: deque = deque()
+        next_start_row: int = 0
+        # Discarded pages may outlive this call: they run with the caller's cap
+        context: contextvars.Context = contextvars.copy_context()
 
-        self.logger.info(f"Total rows obtained: {len(result_df)}")
+        try:
+            while True:
+                while len(in_flight) <= self.prefetch_pages:
+                    in_flight.append(
+                        executor.submit(context.copy().run, fetch_page, next_start_row)
+                    )
+                    next_start_row += self.row_limit
 
-        return result_df
+                yield in_flight.popleft().result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def _to_df(
         self,
@@ -399,6 +1354,10 @@ class GoogleSearchConsole:
         """
         Transforms a raw Search Console response into a DataFrame.
 
+        The keys are transposed into one array per dimension. Repetitive
+        dimensions (CATEGORICAL_DIMENSIONS) become categoricals and metrics
+        use the compact dtypes of METRIC_DTYPES.
+
         Args:
             raw_server_response:
                 Raw response returned by Search Console.
@@ -417,28 +1376,74 @@ class GoogleSearchConsole:
         if not rows:
             return self._empty_df(dimensions)
 
-        results: list[dict[str, Any]] = []
+        row_count: int = len(rows)
+        dimension_arrays: list[np.ndarray] = [
+            np.full(row_count, None, dtype=object) for _ in dimensions
+        ]
 
-        for row in rows:
-            keys: list[str] = row.get("keys", [])
+        for row_index, row in enumerate(rows):
+            for values, key in zip(dimension_arrays, row.get("keys", [])):
+                values[row_index] = key
 
-            record: dict[str, Any] = {
-                dimension: keys[index] if index < len(keys) else None
-                for index, dimension in enumerate(dimensions)
-            }
+        columns: dict[str, Any] = {}
 
-            record.update(
-                {
-                    "clicks": row.get("clicks", 0),
-                    "impressions": row.get("impressions", 0),
-                    "ctr": row.get("ctr", 0),
-                    "position": row.get("position", 0),
-                }
+        for dimension, values in zip(dimensions, dimension_arrays):
+            if dimension in self.CATEGORICAL_DIMENSIONS:
+                columns[dimension] = pd.Categorical(values)
+            else:
+                columns[dimension] = values
+
+        for metric, dtype in self.METRIC_DTYPES.items():
+            metric_values: np.ndarray = np.fromiter(
+                (row.get(metric, 0) for row in rows),
+                dtype=np.float64,
+                count=row_count,
             )
 
-            results.append(record)
+            # Counts above the int32 range keep the wider dtype.
+            if dtype == "int32" and metric_values.max() > np.iinfo(np.int32).max:
+                dtype = "int64"
+
+            columns[metric] = metric_values.astype(dtype)
+
+        return pd.DataFrame(columns)
+
+    def _concat_frames(
+        self,
+        dataframes: list[pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Concatenates report pages keeping the dimensions categorical.
+
+        pd.concat falls back to object when the categories differ, so they
+        are unified first.
+
+        Args:
+            dataframes:
+                Non-empty report pages with the same columns.
 
-        return pd.DataFrame(results)
+        Returns:
+            Concatenated pandas DataFrame.
+        """
+        unified_dtypes: dict[str, pd.CategoricalDtype] = {}
+
+        for column in dataframes[0].columns:
+            if all(
+                isinstance(df[column].dtype, pd.CategoricalDtype)
+                for df in dataframes
+            ):
+                categories: pd.Index = pd.api.types.union_categoricals(
+                    [df[column] for df in dataframes]
+                ).categories
+                unified_dtypes[column] = pd.CategoricalDtype(categories)
+
+        if unified_dtypes:
+            dataframes = [df.astype(unified_dtypes) for df in dataframes]
+
+        return pd.concat(
+            dataframes,
+            ignore_index=True,
+        )
 
     def _empty_df(
         self,
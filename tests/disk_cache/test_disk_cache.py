@@ -0,0 +1,80 @@
+import os
+import time
+
+from d2b_data.disk_cache import DiskCache
+
+
+def test_set_and_get_roundtrip(tmp_path):
+    """A stored payload is returned as-is and written compressed."""
+    cache = DiskCache(str(tmp_path))
+    key = DiskCache.make_key("properties/123", "2024-01-01")
+
+    cache.set(key, {"rows": [{"value": "150"}]})
+
+    assert cache.get(key) == {"rows": [{"value": "150"}]}
+    assert os.listdir(tmp_path) == [f"{key}.json.gz"]
+
+
+def test_get_missing_returns_none(tmp_path):
+    """get returns None for unknown keys."""
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("missing") is None
+
+
+def test_make_key_ignores_dict_order():
+    """Queries that only differ in key order share the same key."""
+    first = DiskCache.make_key({"a": 1, "b": 2}, "2024-01-01")
+    second = DiskCache.make_key({"b": 2, "a": 1}, "2024-01-01")
+    assert first == second
+    assert first != DiskCache.make_key({"a": 1, "b": 2}, "2024-01-02")
+
+
+def test_expired_entries_are_discarded(tmp_path):
+    """Entries older than max_age_seconds are removed on read."""
+    cache = DiskCache(str(tmp_path), max_age_seconds=60)
+    cache.set("old", {"value": 1})
+
+    old_time = time.time() - 120
+    os.utime(cache._path("old"), (old_time, old_time))
+
+    assert cache.get("old") is None
+    assert not os.path.exists(cache._path("old"))
+
+
+def test_size_limit_evicts_oldest_first(tmp_path):
+    """When the size limit is exceeded the oldest entries are removed."""
+    cache = DiskCache(str(tmp_path))
+    for index, key in enumerate(["first", "second", "third"]):
+        cache.set(key, {"payload": "x" * 100})
+        modified_at = time.time() - 100 + index
+        os.utime(cache._path(key), (modified_at, modified_at))
+
+    entry_size = os.path.getsize(cache._path("third"))
+    cache.max_size_bytes = entry_size * 2
+    cache.evict()
+
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+    assert cache.get("third") is not None
+
+
+def test_corrupt_entry_is_removed(tmp_path):
+    """An unreadable entry behaves as a miss and is deleted."""
+    cache = DiskCache(str(tmp_path))
+    with open(cache._path("broken"), "wb") as file:
+        file.write(b"not gzip")
+
+    assert cache.get("broken") is None
+    assert not os.path.exists(cache._path("broken"))
+
+
+def test_clear_removes_everything(tmp_path):
+    """clear deletes every entry."""
+    cache = DiskCache(str(tmp_path))
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
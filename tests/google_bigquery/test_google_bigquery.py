@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def bq(mocker):
+    """Google_Bigquery with mocked credentials and BigQuery client."""
+    mocker.patch(
+        "d2b_data.Google_Bigquery.service_account.Credentials.from_service_account_info",
+        return_value=MagicMock(),
+    )
+    # google.cloud may already be stubbed by other test packages: mock the whole module
+    mocker.patch("d2b_data.Google_Bigquery.bigquery")
+
+    from d2b_data.Google_Bigquery import Google_Bigquery
+
+    return Google_Bigquery(credentials_info={"type": "service_account"})
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03"],
+        "sessions": [1, 2, 3, 4],
+    })
+
+
+def _bigquery():
+    from d2b_data import Google_Bigquery
+
+    return Google_Bigquery.bigquery
+
+
+def _client(bq):
+    return _bigquery().Client.return_value
+
+
+def test_upload_single_job_loads_whole_frame_once(bq, frame):
+    """single_job sends every row in one load job partitioned by the date column."""
+    bq.upload(frame, "date", "dataset.table", "my-project", clean=False, mode="single_job")
+
+    load = _client(bq).load_table_from_dataframe
+    assert load.call_count == 1
+    loaded_df, table_id = load.call_args.args
+    assert table_id == "my-project.dataset.table"
+    assert len(loaded_df) == 4
+    assert str(loaded_df["date"].iloc[0]) == "2024-01-01"
+    assert load.call_args.kwargs["job_config"] is _bigquery().LoadJobConfig.return_value
+    _, partitioning = _bigquery().TimePartitioning.call_args
+    assert partitioning["field"] == "date"
+    _, config = _bigquery().LoadJobConfig.call_args
+    assert config["write_disposition"] == bq.WRITE_DISPOSITIONS["replace"]
+
+
+def test_upload_partitions_loads_one_decorated_partition_per_day(bq, frame):
+    """partitions loads every day into table$YYYYMMDD through the pool."""
+    bq.upload(frame, "date", "dataset.table", "my-project", clean=False,
+              if_exists="append", mode="partitions", max_workers=2)
+
+    load = _client(bq).load_table_from_dataframe
+    loaded = {call.args[1]: len(call.args[0]) for call in load.call_args_list}
+    assert loaded == {
+        "my-project.dataset.table$20240101": 2,
+        "my-project.dataset.table$20240102": 1,
+        "my-project.dataset.table$20240103": 1,
+    }
+    assert load.return_value.result.call_count == 3
+
+
+def test_upload_partitions_loads_first_day_before_the_rest(bq, frame):
+    """The first partition finishes alone, so only one job can create the table."""
+    events = []
+
+    def fake_load(partition_df, table_id, job_config):
+        events.append(("load", table_id[-8:]))
+        job = MagicMock()
+        job.result.side_effect = lambda: events.append(("done", table_id[-8:]))
+        return job
+
+    _client(bq).load_table_from_dataframe.side_effect = fake_load
+
+    bq.upload(frame, "date", "dataset.table", "my-project", clean=False,
+              mode="partitions", max_workers=2)
+
+    assert events[:2] == [("load", "20240101"), ("done", "20240101")]
+    assert len(events) == 6
+
+
+def test_upload_rejects_unknown_mode(bq, frame):
+    with pytest.raises(ValueError):
+        bq.upload(frame, "date", "dataset.table", "my-project", clean=False, mode="bulk")
@@ -1,3 +1,5 @@
+import copy
+import pandas as pd
 from d2b_data.Google_GA4 import Google_GA4
 from unittest.mock import MagicMock
 from googleapiclient.errors import HttpError
@@ -207,4 +209,937 @@ def test_create_daily__create_daily_query(ga4):
     result = ga4._create_daily_query(query, start_date, end_date)
 
     assert result['requests'][0]['dateRanges'][0]['startDate'] == start_date
-    assert result['requests'][0]['dateRanges'][0]['endDate'] == end_date
\ No newline at end of file
+    assert result['requests'][0]['dateRanges'][0]['endDate'] == end_date
+
+
+def test_set_max_workers(ga4):
+    """Tests that max_workers only accepts positive integers"""
+    assert ga4.max_workers == 1
+    assert ga4.set_max_workers(4) == 4
+    assert ga4.set_max_workers(0) == 4
+    assert ga4.set_max_workers("8") == 4
+
+def test_get_paginated_report_concurrent_keeps_date_order(ga4):
+    """Tests that the concurrent paginator reassembles the days in date order"""
+    import time
+    import pandas as pd
+
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-05"}]
+    }]
+    }
+
+    def fake_day(property_id, query, day_str, extract_sampling):
+        # Los primeros días tardan más para forzar un orden de llegada distinto
+        time.sleep(0.01 * (6 - int(day_str[-1])))
+        return [pd.DataFrame({"day": [day_str]})]
+
+    ga4.set_max_workers(3)
+    ga4._get_all_rows_for_day = MagicMock(side_effect=fake_day)
+    result = ga4._get_paginated_report("properties/123", query)
+
+    assert ga4._get_all_rows_for_day.call_count == 5
+    assert list(result["day"]) == [f"2024-01-0{i}" for i in range(1, 6)]
+
+def test_get_thread_service_builds_one_service_per_worker(ga4):
+    """Tests that worker threads never reuse the owner's service object"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    ga4._token_mng.get_thread_service = MagicMock(return_value=MagicMock())
+
+    assert ga4._get_thread_service() is ga4.service
+    assert ga4._token_mng.get_thread_service.call_count == 0
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        worker_service = executor.submit(ga4._get_thread_service).result()
+
+    assert worker_service is not ga4.service
+    assert ga4._token_mng.get_thread_service.call_count == 1
+
+def _report(day, row_count=1, sampled=False):
+    """Builds a one-row raw response for the adaptive planner tests"""
+    report = {
+        "dimensionHeaders": [{"name": "date"}],
+        "metricHeaders": [{"name": "sessions"}],
+        "rows": [{"dimensionValues": [{"value": day}], "metricValues": [{"value": "1"}]}],
+        "rowCount": row_count,
+    }
+    if sampled:
+        report["metadata"] = {"samplingMetadatas": [{"samplesReadCount": "1", "samplingSpaceSize": "2"}]}
+    return {"reports": [report]}
+
+def test_get_report_df_adaptive_uses_whole_range_when_not_sampled(ga4):
+    """Tests that an unsampled range is resolved with a single request"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-31"}]
+    }]
+    }
+
+    ga4.set_adaptive_split(True)
+    ga4._get_report_raw = MagicMock(return_value=_report("2024-01-01"))
+    ga4._get_all_rows_for_day = MagicMock()
+
+    result = ga4.get_report_df("properties/123", query)
+
+    assert ga4._get_report_raw.call_count == 1
+    assert ga4._get_all_rows_for_day.call_count == 0
+    assert len(result) == 1
+
+def test_get_report_df_adaptive_bisects_sampled_and_truncated_windows(ga4, df_fake):
+    """Tests that only sampled or truncated windows are split, down to single days"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-04"}]
+    }]
+    }
+
+    def fake_raw(property_id, window_query):
+        date_range = window_query["requests"][0]["dateRanges"][0]
+        if date_range["startDate"] == "2024-01-01" and date_range["endDate"] == "2024-01-04":
+            return _report(date_range["startDate"], sampled=True)
+        if date_range["startDate"] == "2024-01-01":
+            return _report(date_range["startDate"], row_count=ga4.MAX_ROWS_PER_REQUEST + 1)
+        return _report(date_range["startDate"])
+
+    ga4.set_adaptive_split(True)
+    ga4._get_report_raw = MagicMock(side_effect=fake_raw)
+    ga4._get_all_rows_for_day = MagicMock(
+        side_effect=lambda p, q, day, e: [df_fake.assign(date=day)]
+    )
+
+    result = ga4.get_report_df("properties/123", query)
+
+    # 01-04 (sampled) → 01-02 (truncated) + 03-04 (ok) → 01 + 02 by day
+    assert ga4._get_report_raw.call_count == 3
+    assert ga4._get_all_rows_for_day.call_count == 2
+    assert list(result["date"]) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+def test_get_report_df_adaptive_windows_request_full_pages(ga4):
+    """Tests that window queries ask for the maximum page and a user limit does not force a split"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-04"}],
+        "limit": 100
+    }]
+    }
+
+    ga4.set_adaptive_split(True)
+    ga4._get_report_raw = MagicMock(return_value=_report("2024-01-01", row_count=15000))
+    ga4._get_all_rows_for_day = MagicMock()
+
+    ga4.get_report_df("properties/123", query)
+
+    assert ga4._get_report_raw.call_count == 1
+    assert ga4._get_all_rows_for_day.call_count == 0
+    window_query = ga4._get_report_raw.call_args.args[1]
+    assert window_query["requests"][0]["limit"] == ga4.MAX_ROWS_PER_REQUEST
+
+def test_set_requests_per_batch_is_capped_at_api_limit(ga4):
+    """Tests that requests_per_batch never exceeds the 5 requests accepted by batchRunReports"""
+    assert ga4.requests_per_batch == 1
+    assert ga4.set_requests_per_batch(3) == 3
+    assert ga4.set_requests_per_batch(10) == 5
+    assert ga4.set_requests_per_batch(0) == 5
+
+def test_get_paginated_report_packs_days_into_batches(ga4):
+    """Tests that days are packed five per call and fanned back out in date order"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-07"}]
+    }]
+    }
+
+    def fake_raw(property_id, batch_query):
+        return {"reports": [
+            _report(request["dateRanges"][0]["startDate"])["reports"][0]
+            for request in batch_query["requests"]
+        ]}
+
+    ga4.set_requests_per_batch(5)
+    ga4._get_report_raw = MagicMock(side_effect=fake_raw)
+    result = ga4._get_paginated_report("properties/123", query)
+
+    assert ga4._get_report_raw.call_count == 2
+    sizes = [len(call.args[1]["requests"]) for call in ga4._get_report_raw.call_args_list]
+    assert sizes == [5, 2]
+    assert list(result["date"]) == [f"2024-01-0{i}" for i in range(1, 8)]
+
+def test_get_all_rows_for_days_requests_next_offset_of_full_pages(ga4):
+    """Tests that a full page schedules the next offset of that day in a later batch"""
+    ga4.MAX_ROWS_PER_REQUEST = 1
+    ga4.set_requests_per_batch(5)
+    responses = [
+        {"reports": [_report("2024-01-01")["reports"][0], {"rows": []}]},
+        {"reports": [{"rows": []}]},
+    ]
+    ga4._get_report_raw = MagicMock(side_effect=responses)
+
+    result = ga4._get_all_rows_for_days("properties/123", {"requests": [{}]}, ["2024-01-01", "2024-01-02"])
+
+    second_batch = ga4._get_report_raw.call_args_list[1].args[1]["requests"]
+    assert second_batch[0]["offset"] == 1
+    assert [len(day) for day in result] == [1, 0]
+
+def test_to_dataframe_casts_metrics_by_type(ga4):
+    """Tests that metrics follow metricHeaders[].type and dimensions are categorical"""
+    raw_response = {
+    "reports": [{
+        "dimensionHeaders": [{"name": "city"}],
+        "metricHeaders": [
+            {"name": "sessions", "type": "TYPE_INTEGER"},
+            {"name": "bounceRate", "type": "TYPE_FLOAT"},
+            {"name": "purchaseRevenue", "type": "TYPE_CURRENCY"},
+        ],
+        "rows": [
+            {"dimensionValues": [{"value": "Santiago"}],
+             "metricValues": [{"value": "150"}, {"value": "0.25"}, {"value": "10.5"}]},
+            {"dimensionValues": [{"value": "Santiago"}],
+             "metricValues": [{"value": "3"}, {"value": "1"}, {"value": "0"}]},
+        ]
+        }]
+    }
+
+    result = ga4._to_df(raw_response)
+
+    assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+    assert str(result["sessions"].dtype) == "int64"
+    assert str(result["bounceRate"].dtype) == "float64"
+    assert str(result["purchaseRevenue"].dtype) == "float64"
+    assert result["sessions"].sum() == 153
+
+def test_concat_frames_keeps_categorical_dimensions(ga4):
+    """Tests that pages with different categories are concatenated as one categorical"""
+    first = pd.DataFrame({"city": pd.Categorical(["Santiago"]), "sessions": [1]})
+    second = pd.DataFrame({"city": pd.Categorical(["Lima"]), "sessions": [2]})
+
+    result = ga4._concat_frames([first, second])
+
+    assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+    assert list(result["city"]) == ["Santiago", "Lima"]
+
+def test_get_report_cached_serves_historical_days_from_cache(ga4, tmp_path):
+    """Tests that historical days hit the cache and only the misses reach the API"""
+    from d2b_data.disk_cache import DiskCache
+
+    ga4.set_response_cache(DiskCache(str(tmp_path)), cache_mutable_days=3)
+    query = {"requests": [
+        {"dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-01"}]},
+        {"dateRanges": [{"startDate": "2024-01-02", "endDate": "2024-01-02"}]},
+    ]}
+    ga4._get_report_raw = MagicMock(side_effect=[
+        {"reports": [_report("2024-01-01")["reports"][0], _report("2024-01-02")["reports"][0]]},
+    ])
+
+    first = ga4._get_report_cached("properties/123", query)
+    second = ga4._get_report_cached("properties/123", query)
+
+    assert ga4._get_report_raw.call_count == 1
+    assert second["reports"] == first["reports"]
+
+def test_get_report_cached_only_sends_missing_requests(ga4, tmp_path):
+    """Tests that a partially cached batch only sends the missing sub-queries"""
+    from d2b_data.disk_cache import DiskCache
+
+    ga4.set_response_cache(DiskCache(str(tmp_path)))
+    cached_request = {"dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-01"}]}
+    new_request = {"dateRanges": [{"startDate": "2024-01-02", "endDate": "2024-01-02"}]}
+    ga4.response_cache.set(ga4._cache_key("properties/123", cached_request), {"rows": ["cached"]})
+    ga4._get_report_raw = MagicMock(return_value={"reports": [{"rows": ["fresh"]}]})
+
+    result = ga4._get_report_cached("properties/123", {"requests": [cached_request, new_request]})
+
+    sent = ga4._get_report_raw.call_args.args[1]["requests"]
+    assert sent == [new_request]
+    assert result["reports"] == [{"rows": ["cached"]}, {"rows": ["fresh"]}]
+
+def test_cache_key_bypasses_mutable_window_and_relative_dates(ga4):
+    """Tests that recent days, relative dates and multi-day windows are never cached"""
+    from datetime import date, timedelta
+
+    today = date.today()
+    recent = (today - timedelta(days=1)).isoformat()
+    old = (today - timedelta(days=10)).isoformat()
+
+    def request(start, end):
+        return {"dateRanges": [{"startDate": start, "endDate": end}], "offset": 0}
+
+    assert ga4._cache_key("properties/123", request(recent, recent)) is None
+    assert ga4._cache_key("properties/123", request("yesterday", "yesterday")) is None
+    assert ga4._cache_key("properties/123", request("2024-01-01", "2024-01-02")) is None
+    assert ga4._cache_key("properties/123", request(old, old)) is not None
+    assert ga4._cache_key("properties/123", request(old, old)) != ga4._cache_key(
+        "properties/123", dict(request(old, old), offset=250000)
+    )
+
+def test_cache_key_dates_mutable_window_in_property_timezone(ga4, tmp_path):
+    """Tests that the last mutable day is computed in the property timezone, not the local one"""
+    from datetime import datetime, timedelta
+    from zoneinfo import ZoneInfo
+
+    from d2b_data.disk_cache import DiskCache
+
+    def request(day):
+        return {"dateRanges": [{"startDate": day, "endDate": day}], "offset": 0}
+
+    ga4.set_response_cache(DiskCache(str(tmp_path)), cache_mutable_days=3)
+    earliest_today = datetime.now(ZoneInfo(ga4.EARLIEST_DAY_TIMEZONE)).date()
+    assert ga4._property_today() == earliest_today
+    assert ga4._cache_key("properties/123", request((earliest_today - timedelta(days=2)).isoformat())) is None
+
+    ga4.set_response_cache(DiskCache(str(tmp_path)), cache_mutable_days=3, property_timezone="Pacific/Pago_Pago")
+    property_today = datetime.now(ZoneInfo("Pacific/Pago_Pago")).date()
+    assert ga4._property_today() == property_today
+    assert ga4._cache_key("properties/123", request((property_today - timedelta(days=2)).isoformat())) is None
+    assert ga4._cache_key("properties/123", request((property_today - timedelta(days=3)).isoformat())) is not None
+
+def test_get_report_df_incremental_first_run_uses_full_range(ga4, df_fake, tmp_path):
+    """Tests that the first incremental run fetches the whole range and stores the watermark"""
+    import json
+
+    state_file = tmp_path / "state.json"
+    query = {"requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-10"}],
+        "metrics": [{"name": "sessions"}],
+    }]}
+    ga4.get_report_df = MagicMock(return_value=df_fake.copy())
+
+    result = ga4.get_report_df_incremental("properties/123", query, str(state_file))
+
+    sent_range = ga4.get_report_df.call_args.args[1]["requests"][0]["dateRanges"][0]
+    assert sent_range == {"startDate": "2024-01-01", "endDate": "2024-01-10"}
+    assert result.attrs["incremental_range"] == ("2024-01-01", "2024-01-10")
+    state = json.loads(state_file.read_text())
+    assert [entry["watermark"] for entry in state.values()] == ["2024-01-10"]
+
+def test_get_report_df_incremental_resumes_from_watermark_with_lookback(ga4, df_fake, tmp_path):
+    """Tests that later runs only fetch the days after the watermark plus the lookback window"""
+    state_file = tmp_path / "state.json"
+    first_query = {"requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-10"}],
+        "metrics": [{"name": "sessions"}],
+    }]}
+    second_query = copy.deepcopy(first_query)
+    second_query["requests"][0]["dateRanges"][0]["endDate"] = "2024-01-15"
+    ga4.get_report_df = MagicMock(return_value=df_fake.copy())
+
+    ga4.get_report_df_incremental("properties/123", first_query, str(state_file))
+    ga4.get_report_df_incremental("properties/123", second_query, str(state_file), lookback_days=3)
+
+    sent_range = ga4.get_report_df.call_args.args[1]["requests"][0]["dateRanges"][0]
+    assert sent_range == {"startDate": "2024-01-08", "endDate": "2024-01-15"}
+
+def test_get_report_df_incremental_nothing_new(ga4, tmp_path):
+    """Tests that no request is made when the watermark already covers the range"""
+    state_file = tmp_path / "state.json"
+    query = {"requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-10"}],
+    }]}
+    ga4.get_report_df = MagicMock(return_value=pd.DataFrame({"a": [1]}))
+    ga4.get_report_df_incremental("properties/123", query, str(state_file))
+
+    result = ga4.get_report_df_incremental("properties/123", query, str(state_file), lookback_days=0)
+
+    assert ga4.get_report_df.call_count == 1
+    assert result.empty
+
+def test_resolve_date_accepts_relative_dates(ga4):
+    """Tests that GA4 relative dates are resolved against today"""
+    from datetime import datetime, timedelta
+
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    assert ga4._resolve_date("today") == today
+    assert ga4._resolve_date("yesterday") == today - timedelta(days=1)
+    assert ga4._resolve_date("7daysAgo") == today - timedelta(days=7)
+    assert ga4._resolve_date("2024-01-01") == datetime(2024, 1, 1)
+
+def test_iter_report_yields_pages_in_date_order(ga4):
+    """Tests that iter_report streams every page of every day in date order"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-03"}]
+    }]
+    }
+    ga4.set_max_workers(2)
+    ga4._get_all_rows_for_day = MagicMock(
+        side_effect=lambda p, q, day, e: [pd.DataFrame({"date": [day]}), pd.DataFrame({"date": [day]})]
+    )
+
+    pages = list(ga4.iter_report("properties/123", query))
+
+    assert [page["date"].iloc[0] for page in pages] == [
+        "2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03", "2024-01-03"
+    ]
+
+def test_iter_report_as_arrow_yields_record_batches(ga4, df_fake):
+    """Tests that as_arrow=True converts every page into a pyarrow RecordBatch"""
+    import pyarrow as pa
+
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-02"}]
+    }]
+    }
+    ga4._get_all_rows_for_day = MagicMock(side_effect=[[df_fake], []])
+
+    batches = list(ga4.iter_report("properties/123", query, as_arrow=True))
+
+    assert len(batches) == 1
+    assert isinstance(batches[0], pa.RecordBatch)
+    assert batches[0].schema.names == ["date", "city", "sessions"]
+
+def test_map_concurrent_bounds_items_in_flight(ga4):
+    """Tests that a paused consumer never has more than 2 * max_workers items submitted"""
+    import threading
+
+    started = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            started.append(item)
+        return item
+
+    ga4.set_max_workers(2)
+    results = ga4._map_concurrent(work, list(range(20)))
+
+    assert next(results) == 0
+    assert len(started) <= 5
+    assert list(results) == list(range(1, 20))
+
+def test_nested_pools_share_one_request_limit(ga4):
+    """Tests that days and their offset pages never have more than max_workers requests in flight"""
+    import threading
+    import time
+
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def fake_batch(property, body):
+        request = body["requests"][0]
+        day = request["dateRanges"][0]["startDate"]
+
+        def execute():
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            report = _report(day, row_count=8)["reports"][0]
+            report["rows"] = report["rows"] * 2
+            return {"reports": [report]}
+
+        return MagicMock(execute=execute)
+
+    service = MagicMock()
+    service.properties.return_value.batchRunReports.side_effect = fake_batch
+    ga4._get_thread_service = MagicMock(return_value=service)
+    ga4.MAX_ROWS_PER_REQUEST = 2
+    ga4.set_max_workers(4)
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-08"}]
+    }]
+    }
+
+    result = ga4.get_report_df("properties/123", query)
+
+    assert len(result) == 8 * 8
+    assert in_flight["max"] <= 4
+
+def test_get_report_raw_requests_and_records_property_quota(ga4):
+    """Tests that requests ask for propertyQuota and the response feeds the scheduler"""
+    property_quota = {
+        "tokensPerHour": {"consumed": 10, "remaining": 39990},
+        "tokensPerDay": {"consumed": 10, "remaining": 199990},
+        "concurrentRequests": {"consumed": 0, "remaining": 10},
+    }
+    mock_batch = MagicMock(
+        return_value=MagicMock(execute=MagicMock(return_value={"reports": [{"propertyQuota": property_quota}]}))
+    )
+    ga4.service.properties = MagicMock(return_value=MagicMock(batchRunReports=mock_batch))
+    ga4.set_quota_aware(True)
+
+    ga4._get_report_raw("properties/123", {"requests": [{}]})
+
+    sent_body = mock_batch.call_args.kwargs["body"]
+    assert sent_body["requests"][0]["returnPropertyQuota"] is True
+    buckets = ga4.get_property_quota("properties/123")
+    assert buckets["tokensPerHour"]["limit"] == 40000
+    assert buckets["tokensPerHour"]["tokens"] == 39990
+    assert buckets["tokensPerDay"]["limit"] == 200000
+
+def test_get_report_raw_without_quota_awareness_sends_query_untouched(ga4):
+    """Tests that quota_aware=False leaves the request body as given"""
+    mock_batch = MagicMock(return_value=MagicMock(execute=MagicMock(return_value={"reports": []})))
+    ga4.service.properties = MagicMock(return_value=MagicMock(batchRunReports=mock_batch))
+    ga4.set_quota_aware(False)
+
+    ga4._get_report_raw("properties/123", {"requests": [{}]})
+
+    assert mock_batch.call_args.kwargs["body"] == {"requests": [{}]}
+    assert ga4.get_property_quota("properties/123") == {}
+
+def test_quota_scheduler_paces_before_hourly_exhaustion(mocker):
+    """Tests that the scheduler sleeps when the hourly bucket is below the reserve"""
+    from d2b_data.Google_GA4 import _QuotaScheduler
+
+    mock_sleep = mocker.patch("d2b_data.Google_GA4.time.sleep")
+    scheduler = _QuotaScheduler()
+    scheduler.acquire()
+    scheduler.release({"tokensPerHour": {"consumed": 100, "remaining": 39900}})
+    # Quedan pocos tokens: menos que el costo + 10% del límite
+    scheduler.buckets["tokensPerHour"]["tokens"] = 1000
+
+    waited = scheduler.acquire()
+
+    assert waited > 0
+    mock_sleep.assert_called_once_with(waited)
+    scheduler.release()
+
+def test_quota_scheduler_caps_hourly_wait(mocker):
+    """Tests that an hourly pacing wait never exceeds MAX_WAIT_SECONDS"""
+    from d2b_data.Google_GA4 import _QuotaScheduler
+
+    mocker.patch("d2b_data.Google_GA4.time.sleep")
+    scheduler = _QuotaScheduler()
+    scheduler.acquire()
+    scheduler.release({"tokensPerHour": {"consumed": 100, "remaining": 39900}})
+    scheduler.buckets["tokensPerHour"]["tokens"] = 0
+
+    assert scheduler.acquire() == _QuotaScheduler.MAX_WAIT_SECONDS
+    scheduler.release()
+
+def test_quota_scheduler_never_sleeps_on_daily_quota(mocker):
+    """Tests that a property past its daily reserve warns once, through the log callback, instead of sleeping"""
+    from d2b_data.Google_GA4 import _QuotaScheduler
+
+    mock_sleep = mocker.patch("d2b_data.Google_GA4.time.sleep")
+    log = MagicMock()
+    scheduler = _QuotaScheduler(log=log)
+    scheduler.acquire()
+    scheduler.release({"tokensPerDay": {"consumed": 10, "remaining": 200000}})
+    scheduler.acquire()
+    scheduler.release({"tokensPerDay": {"consumed": 10, "remaining": 19000}})
+
+    for _ in range(3):
+        assert scheduler.acquire() == 0
+        scheduler.release({"tokensPerDay": {"consumed": 10, "remaining": 18000}})
+
+    assert mock_sleep.call_count == 0
+    assert log.call_count == 1
+    assert "daily tokens" in log.call_args.args[0]
+
+def test_quota_scheduler_reports_through_client_debug(ga4):
+    """Tests that the schedulers of a client log through its debug method"""
+    assert ga4._get_quota_scheduler("properties/123").log == ga4.debug
+
+def test_quota_awareness_is_off_by_default(ga4):
+    """Tests that quota pacing is opt-in"""
+    assert ga4.quota_aware is False
+
+def test_quota_scheduler_caps_concurrency_with_reported_limit():
+    """Tests that concurrentRequests from the API becomes the concurrency cap"""
+    from d2b_data.Google_GA4 import _QuotaScheduler
+
+    scheduler = _QuotaScheduler()
+    scheduler.acquire()
+    scheduler.release({"concurrentRequests": {"consumed": 1, "remaining": 2}})
+
+    assert scheduler.max_concurrent == 3
+    assert scheduler.in_flight == 0
+
+def test_get_report_df_many_tags_rows_and_reports_failures(ga4):
+    """Tests that every property is tagged and a failure does not abort the batch"""
+    def fake_report(property_id, query, extract_sampling=None):
+        if property_id == "properties/2":
+            raise RuntimeError("403 forbidden")
+        return pd.DataFrame({"city": pd.Categorical(["Santiago"]), "sessions": [1]})
+
+    ga4.get_report_df = MagicMock(side_effect=fake_report)
+
+    result, status = ga4.get_report_df_many(
+        ["properties/1", "properties/2", "properties/3"], {"requests": [{}]}
+    )
+
+    assert list(result["property_id"]) == ["properties/1", "properties/3"]
+    assert list(result.columns) == ["property_id", "city", "sessions"]
+    assert status["properties/1"] == {"status": "ok", "rows": 1}
+    assert status["properties/2"]["status"] == "error"
+    assert "403" in status["properties/2"]["error"]
+
+def test_get_report_df_many_paces_with_quota_scheduler(ga4):
+    """Tests that the fan-out uses the quota schedulers even when the instance has them off"""
+    property_quota = {"tokensPerHour": {"consumed": 10, "remaining": 39990}}
+    mock_batch = MagicMock(
+        return_value=MagicMock(execute=MagicMock(return_value={"reports": [{"propertyQuota": property_quota}]}))
+    )
+    service = MagicMock()
+    service.properties.return_value.batchRunReports = mock_batch
+    ga4._get_thread_service = MagicMock(return_value=service)
+    ga4.set_auto_paginate(False)
+
+    ga4.get_report_df_many(["properties/1", "properties/2"], {"requests": [{}]})
+
+    assert ga4.quota_aware is False
+    assert all(call.kwargs["body"]["requests"][0]["returnPropertyQuota"] for call in mock_batch.call_args_list)
+    assert ga4.get_property_quota("properties/2")["tokensPerHour"]["tokens"] == 39990
+
+    mock_batch.reset_mock()
+    ga4.get_report_df_many(["properties/3"], {"requests": [{}]}, quota_aware=False)
+
+    assert mock_batch.call_args.kwargs["body"] == {"requests": [{}]}
+
+def test_get_report_df_many_all_failed_returns_empty(ga4):
+    """Tests that an empty DataFrame is returned when every property fails"""
+    ga4.get_report_df = MagicMock(side_effect=RuntimeError("boom"))
+
+    result, status = ga4.get_report_df_many(["properties/1"], {"requests": [{}]})
+
+    assert result.empty
+    assert status["properties/1"]["status"] == "error"
+
+def test_get_all_rows_for_day_shards_days_with_other_rows(ga4):
+    """Tests that a lossy day is refetched with one shard per value of the split dimension"""
+    lossy = _report("2024-01-01")
+    lossy["reports"][0]["metadata"] = {"dataLossFromOtherRow": True}
+    values = {"reports": [{
+        "dimensionHeaders": [{"name": "country"}],
+        "metricHeaders": [{"name": "sessions"}],
+        "rows": [
+            {"dimensionValues": [{"value": "Chile"}], "metricValues": [{"value": "5"}]},
+            {"dimensionValues": [{"value": "Peru"}], "metricValues": [{"value": "3"}]},
+        ],
+    }]}
+
+    def fake_cached(property_id, query):
+        request = query["requests"][0]
+        if request.get("dimensions") == [{"name": "country"}]:
+            return values
+        shard = request.get("dimensionFilter")
+        if shard is None:
+            return lossy
+        return _report(shard["filter"]["stringFilter"]["value"])
+
+    ga4.set_cardinality_sharding("country")
+    ga4._get_report_cached = MagicMock(side_effect=fake_cached)
+    query = {"requests": [{
+        "dimensions": [{"name": "date"}, {"name": "country"}],
+        "metrics": [{"name": "sessions"}]
+    }]}
+
+    result = ga4._get_all_rows_for_day("properties/123", query, "2024-01-01")
+
+    assert [df["date"].iloc[0] for df in result] == ["Chile", "Peru"]
+    filters = [
+        call.args[1]["requests"][0]["dimensionFilter"]["filter"]["stringFilter"]
+        for call in ga4._get_report_cached.call_args_list
+        if "dimensionFilter" in call.args[1]["requests"][0]
+    ]
+    assert [(f["matchType"], f["value"]) for f in filters] == [("EXACT", "Chile"), ("EXACT", "Peru")]
+
+def test_get_all_rows_for_day_over_max_shards_keeps_lossy_rows(ga4, capsys):
+    """Tests that a dimension with more values than max_shards is not sharded"""
+    lossy = _report("2024-01-01")
+    lossy["reports"][0]["metadata"] = {"dataLossFromOtherRow": True}
+    values = {"reports": [{
+        "dimensionHeaders": [{"name": "country"}],
+        "metricHeaders": [{"name": "sessions"}],
+        "rows": [
+            {"dimensionValues": [{"value": name}], "metricValues": [{"value": "1"}]}
+            for name in ["Chile", "Peru", "Bolivia"]
+        ],
+    }]}
+
+    def fake_cached(property_id, query):
+        if query["requests"][0].get("dimensions") == [{"name": "country"}]:
+            return values
+        return lossy
+
+    ga4.debug_status = True
+    ga4.set_cardinality_sharding("country", max_shards=2)
+    ga4._get_report_cached = MagicMock(side_effect=fake_cached)
+    query = {"requests": [{
+        "dimensions": [{"name": "date"}, {"name": "country"}],
+        "metrics": [{"name": "sessions"}]
+    }]}
+
+    result = ga4._get_all_rows_for_day("properties/123", query, "2024-01-01")
+
+    assert ga4._get_report_cached.call_count == 2
+    assert len(result) == 1
+    assert "max_shards=2" in capsys.readouterr().out
+
+def test_sharding_requires_shard_dimension_in_query(ga4):
+    """Tests that sharding by a dimension the query does not return is rejected"""
+    lossy = _report("2024-01-01")
+    lossy["reports"][0]["metadata"] = {"dataLossFromOtherRow": True}
+    ga4.set_cardinality_sharding("country")
+    ga4._get_report_cached = MagicMock(return_value=lossy)
+    query = {"requests": [{"dimensions": [{"name": "date"}], "metrics": [{"name": "sessions"}]}]}
+
+    with pytest.raises(ValueError):
+        ga4._get_all_rows_for_day("properties/123", query, "2024-01-01")
+
+    assert ga4._get_report_cached.call_count == 1
+
+def test_get_all_rows_for_day_without_shard_dimension_keeps_lossy_rows(ga4):
+    """Tests that nothing is sharded unless a split dimension was nominated"""
+    lossy = _report("2024-01-01")
+    lossy["reports"][0]["metadata"] = {"dataLossFromOtherRow": True}
+    ga4._get_report_cached = MagicMock(return_value=lossy)
+
+    result = ga4._get_all_rows_for_day("properties/123", {"requests": [{}]}, "2024-01-01")
+
+    assert ga4._get_report_cached.call_count == 1
+    assert len(result) == 1
+
+def test_shard_filters_with_prefixes_add_remainder_shard(ga4):
+    """Tests that prefix sharding covers every value with a NOT(any prefix) shard"""
+    ga4.set_cardinality_sharding("pagePath", shard_prefixes=["/blog", "/shop"])
+
+    filters = ga4._get_shard_filters("properties/123", {"requests": [{}]}, "2024-01-01")
+
+    assert [f["filter"]["stringFilter"]["value"] for f in filters[:2]] == ["/blog", "/shop"]
+    assert filters[2] == {"notExpression": {"orGroup": {"expressions": filters[:2]}}}
+
+def test_create_shard_query_ands_existing_filter(ga4):
+    """Tests that the shard filter is combined with the original dimensionFilter"""
+    existing = ga4._string_filter("country", "EXACT", "Chile")
+    shard = ga4._string_filter("city", "EXACT", "Santiago")
+    query = {"requests": [{"dimensionFilter": existing}]}
+
+    result = ga4._create_shard_query(query, shard)
+
+    assert result["requests"][0]["dimensionFilter"] == {"andGroup": {"expressions": [existing, shard]}}
+    assert query["requests"][0]["dimensionFilter"] == existing
+
+def test_set_days_per_request_is_capped_at_four_date_ranges(ga4):
+    """Tests that days_per_request never exceeds the 4 dateRanges accepted per request"""
+    assert ga4.days_per_request == 1
+    assert ga4.set_days_per_request(4) == 4
+    assert ga4.set_days_per_request(7) == 4
+
+def test_get_paginated_report_packs_days_as_date_ranges(ga4):
+    """Tests that four days travel in one request and rows are split back by dateRange"""
+    query = {
+    "requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-05"}],
+        "dimensions": [{"name": "city"}],
+    }]
+    }
+
+    def fake_raw(property_id, batch_query):
+        reports = []
+        for request in batch_query["requests"]:
+            names = [date_range.get("name") for date_range in request["dateRanges"]]
+            headers = [{"name": "city"}] + ([{"name": "dateRange"}] if len(names) > 1 else [])
+            rows = [
+                {"dimensionValues": [{"value": "Santiago"}] + ([{"value": name}] if len(names) > 1 else []),
+                 "metricValues": [{"value": "1"}]}
+                for name in names
+            ]
+            reports.append({"dimensionHeaders": headers, "metricHeaders": [{"name": "sessions"}], "rows": rows})
+        return {"reports": reports}
+
+    ga4.set_days_per_request(4)
+    ga4._get_report_raw = MagicMock(side_effect=fake_raw)
+    pages = list(ga4._iter_paginated_report("properties/123", query))
+
+    sent = [call.args[1]["requests"] for call in ga4._get_report_raw.call_args_list]
+    assert [len(requests[0]["dateRanges"]) for requests in sent] == [4, 1]
+    assert sent[0][0]["dateRanges"][0] == {"startDate": "2024-01-01", "endDate": "2024-01-01", "name": "2024-01-01"}
+    assert len(pages) == 5
+    assert all(list(page.columns) == ["city", "sessions"] for page in pages)
+
+def test_split_by_date_range_keeps_day_order(ga4):
+    """Tests that the rows of each day are returned in the order of the group"""
+    group_df = pd.DataFrame({
+        "city": ["a", "b", "c"],
+        "dateRange": pd.Categorical(["2024-01-02", "2024-01-01", "2024-01-02"]),
+    })
+
+    result = ga4._split_by_date_range(group_df, ("2024-01-01", "2024-01-02"))
+
+    assert [day for day, _ in result] == ["2024-01-01", "2024-01-02"]
+    assert list(result[1][1]["city"]) == ["a", "c"]
+    assert "dateRange" not in result[0][1].columns
+
+def _page(rows, row_count):
+    """Builds a raw response with a given number of rows and rowCount"""
+    return {"reports": [{
+        "dimensionHeaders": [{"name": "city"}],
+        "metricHeaders": [{"name": "sessions"}],
+        "rows": [{"dimensionValues": [{"value": "a"}], "metricValues": [{"value": "1"}]}] * rows,
+        "rowCount": row_count,
+    }]}
+
+def test_get_all_rows_for_day_prefetches_offsets_from_row_count(ga4):
+    """Tests that every remaining offset comes from rowCount and no empty page is requested"""
+    ga4.MAX_ROWS_PER_REQUEST = 2
+    ga4.set_max_workers(3)
+
+    def fake_cached(property_id, query):
+        offset = query["requests"][0]["offset"]
+        return _page(2 if offset < 6 else 1, 7)
+
+    ga4._get_report_cached = MagicMock(side_effect=fake_cached)
+
+    result = ga4._get_all_rows_for_day("properties/123", {"requests": [{}]}, "2024-01-01")
+
+    offsets = sorted(call.args[1]["requests"][0]["offset"] for call in ga4._get_report_cached.call_args_list)
+    assert offsets == [0, 2, 4, 6]
+    assert sum(len(df) for df in result) == 7
+    assert all(call.args[1]["requests"][0]["limit"] == 2 for call in ga4._get_report_cached.call_args_list)
+
+def test_get_all_rows_for_day_exact_page_skips_trailing_request(ga4):
+    """Tests that a day whose rowCount equals the page size makes a single request"""
+    ga4.MAX_ROWS_PER_REQUEST = 2
+    ga4._get_report_cached = MagicMock(return_value=_page(2, 2))
+
+    result = ga4._get_all_rows_for_day("properties/123", {"requests": [{}]}, "2024-01-01")
+
+    assert ga4._get_report_cached.call_count == 1
+    assert len(result) == 1
+
+def test_get_all_rows_for_day_respects_user_limit(ga4):
+    """Tests that a limit below the maximum is a cap, not a page size"""
+    ga4._get_report_cached = MagicMock(return_value=_page(3, 100))
+
+    result = ga4._get_all_rows_for_day("properties/123", {"requests": [{"limit": 3}]}, "2024-01-01")
+
+    assert ga4._get_report_cached.call_count == 1
+    assert len(result[0]) == 3
+
+METADATA = {
+    "dimensions": [{"apiName": "date"}, {"apiName": "city"}],
+    "metrics": [{"apiName": "sessions", "type": "TYPE_INTEGER"}],
+}
+
+def _mock_metadata_service(ga4, compatibility=None):
+    """Mocks getMetadata/checkCompatibility and returns the properties() mock"""
+    properties = MagicMock()
+    properties.getMetadata.return_value.execute.return_value = METADATA
+    properties.checkCompatibility.return_value.execute.return_value = compatibility or {}
+    ga4.service.properties = MagicMock(return_value=properties)
+    return properties
+
+def test_get_metadata_is_cached_in_memory_and_on_disk(ga4, tmp_path):
+    """Tests that metadata is downloaded once and persisted for later runs"""
+    from d2b_data.disk_cache import DiskCache
+
+    properties = _mock_metadata_service(ga4)
+    ga4.metadata_cache = DiskCache(str(tmp_path), max_age_seconds=86400)
+
+    assert ga4.get_metadata("properties/123") == METADATA
+    assert ga4.get_metadata("properties/123") == METADATA
+    assert properties.getMetadata.call_count == 1
+    properties.getMetadata.assert_called_with(name="properties/123/metadata")
+
+    ga4._metadata = {}
+    assert ga4.get_metadata("properties/123") == METADATA
+    assert properties.getMetadata.call_count == 1
+
+def test_validate_query_rejects_unknown_fields(ga4):
+    """Tests that unknown dimensions/metrics fail before any report call"""
+    properties = _mock_metadata_service(ga4)
+    query = {"requests": [{"dimensions": [{"name": "cityy"}], "metrics": [{"name": "sessions"}]}]}
+
+    with pytest.raises(ValueError, match="Unknown fields for properties/123: cityy"):
+        ga4.validate_query("properties/123", query)
+
+    assert properties.checkCompatibility.call_count == 0
+
+def test_validate_query_rejects_incompatible_fields(ga4):
+    """Tests that INCOMPATIBLE fields from checkCompatibility raise ValueError"""
+    _mock_metadata_service(ga4, compatibility={
+        "dimensionCompatibilities": [
+            {"dimensionMetadata": {"apiName": "city"}, "compatibility": "INCOMPATIBLE"}
+        ],
+        "metricCompatibilities": [
+            {"metricMetadata": {"apiName": "sessions"}, "compatibility": "COMPATIBLE"}
+        ],
+    })
+    query = {"requests": [{"dimensions": [{"name": "city"}], "metrics": [{"name": "sessions"}]}]}
+
+    with pytest.raises(ValueError, match="Incompatible fields for properties/123: city"):
+        ga4.validate_query("properties/123", query)
+
+def test_get_report_df_with_validation_fails_before_report_call(ga4):
+    """Tests that validate_queries stops a bad query without spending a report request"""
+    _mock_metadata_service(ga4)
+    ga4.set_validate_queries(True)
+    ga4._get_report_raw = MagicMock()
+    query = {"requests": [{
+        "dateRanges": [{"startDate": "2024-01-01", "endDate": "2024-01-01"}],
+        "metrics": [{"name": "nope"}],
+    }]}
+
+    with pytest.raises(ValueError):
+        ga4.get_report_df("properties/123", query)
+
+    assert ga4._get_report_raw.call_count == 0
+
+def test_to_dataframe_uses_metadata_types_when_header_has_none(ga4):
+    """Tests that cached metadata supplies the dtype of untyped metric headers"""
+    _mock_metadata_service(ga4)
+    ga4.get_metadata("properties/123")
+    raw_response = {"reports": [{
+        "metricHeaders": [{"name": "sessions"}],
+        "rows": [{"metricValues": [{"value": "150"}]}],
+    }]}
+
+    result = ga4._to_df(raw_response)
+
+    assert str(result["sessions"].dtype) == "int64"
+
+def _realtime(rows):
+    """Builds a runRealtimeReport response from (country, activeUsers) pairs"""
+    return {
+        "dimensionHeaders": [{"name": "country"}],
+        "metricHeaders": [{"name": "activeUsers", "type": "TYPE_INTEGER"}],
+        "rows": [
+            {"dimensionValues": [{"value": country}], "metricValues": [{"value": str(users)}]}
+            for country, users in rows
+        ],
+    }
+
+def test_poll_realtime_emits_only_changed_rows(ga4, mocker):
+    """Tests that each poll yields only new rows or rows whose metrics changed"""
+    mock_sleep = mocker.patch("d2b_data.Google_GA4.time.sleep")
+    properties = MagicMock()
+    properties.runRealtimeReport.return_value.execute.side_effect = [
+        _realtime([("Chile", 5), ("Peru", 2)]),
+        _realtime([("Chile", 5), ("Peru", 3), ("Mexico", 1)]),
+        _realtime([("Chile", 5), ("Peru", 3), ("Mexico", 1)]),
+    ]
+    ga4.service.properties = MagicMock(return_value=properties)
+    query = {"dimensions": [{"name": "country"}], "metrics": [{"name": "activeUsers"}]}
+
+    deltas = list(ga4.poll_realtime("properties/123", query, interval=30, max_polls=3))
+
+    assert list(deltas[0]["country"]) == ["Chile", "Peru"]
+    assert list(deltas[1]["country"]) == ["Peru", "Mexico"]
+    assert list(deltas[1]["activeUsers"]) == [3, 1]
+    assert deltas[2].empty
+    assert mock_sleep.call_count == 2
+    properties.runRealtimeReport.assert_called_with(property="properties/123", body=query)
+
+def test_poll_realtime_accepts_batch_style_query(ga4, mocker):
+    """Tests that a {"requests": [...]} query is reduced to its realtime body"""
+    mocker.patch("d2b_data.Google_GA4.time.sleep")
+    properties = MagicMock()
+    properties.runRealtimeReport.return_value.execute.return_value = _realtime([])
+    ga4.service.properties = MagicMock(return_value=properties)
+    query = {"requests": [{
+        "dateRanges": [{"startDate": "today", "endDate": "today"}],
+        "metrics": [{"name": "activeUsers"}],
+    }]}
+
+    list(ga4.poll_realtime("properties/123", query, max_polls=1))
+
+    properties.runRealtimeReport.assert_called_once_with(
+        property="properties/123", body={"metrics": [{"name": "activeUsers"}]}
+    )
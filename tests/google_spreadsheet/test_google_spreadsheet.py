@@ -17,6 +17,19 @@ def test_instance_is_created_correctly(gs):
     assert gs.service is gs.token_manager.get_service.return_value
 
 
+
+def test_worker_threads_use_their_own_service(gs):
+    """Other threads get a per-thread service from the token manager."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    assert gs._get_service() is gs.service
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        worker_service = executor.submit(gs._get_service).result()
+
+    assert worker_service is gs.token_manager.get_thread_service.return_value
+    assert worker_service is not gs.service
+
 def test_oauth_mode_passes_path_as_secret_and_token(token_mng):
     """In OAuth mode the same file acts as client secret and token."""
     Google_Spreadsheet(credentials_path="creds.json")
@@ -33,3 +33,15 @@ def make_token_mng(mocker):
         return Google_Token_MNG(**params)
 
     return _make
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Memoized credentials and pooled services must not leak between tests."""
+    from d2b_data.Google_Token_MNG import Google_Token_MNG
+
+    Google_Token_MNG.clear_credentials_cache()
+    Google_Token_MNG._service_pool.services = {}
+    yield
+    Google_Token_MNG.clear_credentials_cache()
+    Google_Token_MNG._service_pool.services = {}
@@ -240,3 +240,319 @@ def test_get_credentials_requires_secret_when_no_token(mocker, tmp_path):
             credentials=str(missing),
             scopes=["scope"],
         )
+
+
+def test_credentials_are_memoized_per_configuration(mocker, tmp_path):
+    """A second manager with the same configuration does not reload the token."""
+    token_file = tmp_path / "token.json"
+    token_file.write_text('{"access_token": "abc"}', encoding="utf-8")
+
+    mock_new = mocker.patch(
+        "d2b_data.Google_Token_MNG.client.Credentials.new_from_json",
+        return_value=MagicMock(),
+    )
+    mocker.patch("d2b_data.Google_Token_MNG.build", return_value="service")
+
+    params = {
+        "client_secret": "secret.json",
+        "token": str(token_file),
+        "api_name": "searchconsole",
+        "api_version": "v1",
+        "scopes": ["scope"],
+    }
+    Google_Token_MNG(**params)
+    Google_Token_MNG(**params)
+    Google_Token_MNG(**dict(params, scopes=["other-scope"]))
+
+    assert mock_new.call_count == 2
+
+
+def test_slow_credentials_load_does_not_block_other_configurations(make_token_mng, mocker):
+    """A load waiting on the user only blocks callers of the same configuration."""
+    import threading
+
+    mng = make_token_mng()
+    release_slow = threading.Event()
+
+    def fake_load(secrets, credentials, scopes, use_sa=False):
+        if credentials == "slow.json":
+            release_slow.wait(timeout=5)
+        return MagicMock(name=credentials)
+
+    mock_load = mocker.patch.object(mng, "_load_credentials", side_effect=fake_load)
+
+    slow = threading.Thread(
+        target=mng.get_cached_credentials, args=(None, "slow.json", ["scope"])
+    )
+    slow.start()
+    fast = threading.Thread(
+        target=mng.get_cached_credentials, args=(None, "fast.json", ["scope"])
+    )
+    fast.start()
+    fast.join(timeout=2)
+    fast_finished_first = not fast.is_alive()
+
+    release_slow.set()
+    slow.join(timeout=5)
+    mng.get_cached_credentials(None, "slow.json", ["scope"])
+
+    assert fast_finished_first
+    assert mock_load.call_count == 2
+
+
+def test_get_thread_service_gives_each_thread_its_own_service(mocker):
+    """Worker threads get one pooled service each; the owner keeps self.service."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    mocker.patch(
+        "d2b_data.Google_Token_MNG.google.auth.default",
+        return_value=(MagicMock(), "my-project"),
+    )
+    mock_build = mocker.patch(
+        "d2b_data.Google_Token_MNG.build",
+        side_effect=lambda *args, **kwargs: MagicMock(),
+    )
+
+    tm = Google_Token_MNG(
+        client_secret=None,
+        token=None,
+        api_name="searchconsole",
+        api_version="v1",
+        scopes=["scope"],
+        use_service_account=True,
+    )
+
+    assert tm.get_thread_service() is tm.service
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        services = list(executor.map(lambda _: tm.get_thread_service(), range(8)))
+
+    assert tm.service not in services
+    assert len({id(service) for service in services}) <= 2
+    assert mock_build.call_count == 1 + len({id(service) for service in services})
+
+
+def test_clear_credentials_cache_rebuilds_pooled_services_and_sessions(mocker):
+    """After clearing, worker threads and sessions are rebuilt from freshly loaded credentials."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    mocker.patch.object(Google_Token_MNG, "_sessions", {})
+    mock_default = mocker.patch(
+        "d2b_data.Google_Token_MNG.google.auth.default",
+        side_effect=lambda scopes: (MagicMock(), "my-project"),
+    )
+    mocker.patch(
+        "d2b_data.Google_Token_MNG.build",
+        side_effect=lambda *args, **kwargs: MagicMock(),
+    )
+
+    tm = Google_Token_MNG(
+        client_secret=None,
+        token=None,
+        api_name="searchconsole",
+        api_version="v1",
+        scopes=["scope"],
+        use_service_account=True,
+        transport="session",
+    )
+    old_session = next(iter(Google_Token_MNG._sessions.values()))
+    old_session.close = MagicMock()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        before = executor.submit(tm.get_thread_service).result()
+        Google_Token_MNG.clear_credentials_cache()
+        after = executor.submit(tm.get_thread_service).result()
+
+    assert after is not before
+    assert mock_default.call_count == 2
+    old_session.close.assert_called_once()
+    assert next(iter(Google_Token_MNG._sessions.values())) is not old_session
+
+
+def _fake_session_response(payload, headers=None):
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "application/json", **(headers or {})}
+    response.content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+def test_session_transport_executes_googleapiclient_requests(mocker):
+    """Services built on the session transport send their requests through the pooled session."""
+    from googleapiclient.discovery import build
+
+    from d2b_data.Google_Token_MNG import _SessionHttp
+
+    session = MagicMock()
+    session.request.return_value = _fake_session_response(
+        {"siteEntry": []}, headers={"Content-Encoding": "gzip", "Content-Length": "10"}
+    )
+
+    service = build(
+        "searchconsole", "v1", http=_SessionHttp(session), cache_discovery=False
+    )
+
+    assert service.sites().list().execute() == {"siteEntry": []}
+    _, kwargs = session.request.call_args
+    assert kwargs["headers"]["accept-encoding"] == "gzip"
+    assert "gzip" in kwargs["headers"]["user-agent"]
+
+
+def test_session_transport_shares_one_pooled_session_per_credentials(mocker):
+    """Managers with the same credentials reuse one keep-alive session with the configured pool."""
+    mocker.patch.object(Google_Token_MNG, "_sessions", {})
+    mocker.patch(
+        "d2b_data.Google_Token_MNG.google.auth.default",
+        return_value=(MagicMock(), "my-project"),
+    )
+    mock_build = mocker.patch(
+        "d2b_data.Google_Token_MNG.build", return_value="service"
+    )
+    mock_adapter = mocker.patch("d2b_data.Google_Token_MNG.requests.adapters.HTTPAdapter")
+
+    params = {
+        "client_secret": None,
+        "token": None,
+        "api_name": "searchconsole",
+        "api_version": "v1",
+        "scopes": ["scope"],
+        "use_service_account": True,
+        "transport": "session",
+        "pool_maxsize": 32,
+    }
+    Google_Token_MNG(**params)
+    Google_Token_MNG(**params)
+
+    first_http = mock_build.call_args_list[0].kwargs["http"]
+    second_http = mock_build.call_args_list[1].kwargs["http"]
+    assert first_http.session is second_http.session
+    assert "credentials" not in mock_build.call_args_list[0].kwargs
+    pooled_adapters = [
+        call for call in mock_adapter.call_args_list
+        if call.kwargs == {"pool_connections": 32, "pool_maxsize": 32}
+    ]
+    assert len(pooled_adapters) == 1
+
+
+def test_set_default_transport_rejects_unknown_transport():
+    """Only the supported transports can be selected."""
+    with pytest.raises(ValueError):
+        Google_Token_MNG.set_default_transport("grpc")
+
+
+def _oauth_credentials(expires_in_seconds):
+    from datetime import UTC, datetime, timedelta
+
+    from oauth2client import client
+
+    return client.OAuth2Credentials(
+        access_token="access",
+        client_id="client-id",
+        client_secret="client-secret",
+        refresh_token="refresh",
+        token_expiry=datetime.now(UTC).replace(tzinfo=None)
+        + timedelta(seconds=expires_in_seconds),
+        token_uri="https://oauth2.googleapis.com/token",
+        user_agent=None,
+    )
+
+
+def test_token_storage_persists_atomically(make_token_mng, tmp_path):
+    """The token store writes the refreshed token and reads it back."""
+    from d2b_data.Google_Token_MNG import _AtomicTokenStorage
+
+    token_file = tmp_path / "token.json"
+    storage = _AtomicTokenStorage(str(token_file), make_token_mng().open_json)
+    credentials = _oauth_credentials(3600)
+    credentials.access_token = "refreshed"
+
+    storage.locked_put(credentials)
+    loaded = storage.locked_get()
+
+    assert loaded.access_token == "refreshed"
+    assert loaded.store is storage
+    assert [path.name for path in tmp_path.iterdir()] == ["token.json"]
+
+
+def test_token_storage_refreshes_double_encoded_token(make_token_mng, tmp_path):
+    """A double-encoded token file is unwrapped when a refresh reads it back."""
+    import httplib2
+
+    from d2b_data.Google_Token_MNG import _AtomicTokenStorage
+
+    token_file = tmp_path / "token.json"
+    token_file.write_text(json.dumps(_oauth_credentials(3600).to_json()), encoding="utf-8")
+    storage = _AtomicTokenStorage(str(token_file), make_token_mng().open_json)
+
+    credentials = storage.get()
+    http = MagicMock()
+    http.request.return_value = (
+        httplib2.Response({"status": "200"}),
+        b'{"access_token": "new-access", "expires_in": 3600}',
+    )
+    credentials.refresh(http)
+
+    assert credentials.access_token == "new-access"
+    assert json.loads(token_file.read_text(encoding="utf-8"))["access_token"] == "new-access"
+
+
+def test_token_refresher_refreshes_ahead_of_expiry():
+    """The refresher waits until the margin and updates the mirrored credentials."""
+    from d2b_data.Google_Token_MNG import _TokenRefresher
+
+    credentials = _oauth_credentials(600)
+    refresher = _TokenRefresher(credentials, margin_seconds=300)
+
+    assert 290 < refresher.seconds_until_refresh() <= 300
+
+    def fake_refresh(http):
+        credentials.access_token = "new-access"
+
+    credentials.refresh = MagicMock(side_effect=fake_refresh)
+    mirror = MagicMock()
+    refresher.add_mirror(mirror)
+    refresher.refresh()
+
+    assert mirror.token == "new-access"
+    assert mirror.expiry == credentials.token_expiry
+
+
+def test_token_refresher_thread_refreshes_expiring_token():
+    """A token already inside the margin is refreshed by the background thread."""
+    import threading
+
+    from d2b_data.Google_Token_MNG import _TokenRefresher
+
+    credentials = _oauth_credentials(10)
+    refreshed = threading.Event()
+    credentials.refresh = MagicMock(side_effect=lambda http: refreshed.set())
+
+    refresher = _TokenRefresher(credentials, margin_seconds=300).start()
+    try:
+        assert refreshed.wait(timeout=5)
+    finally:
+        refresher.stop()
+
+
+def test_oauth_token_gets_store_and_background_refresher(mocker, tmp_path):
+    """Tokens loaded from disk refresh through the atomic store and a background refresher."""
+    from d2b_data.Google_Token_MNG import _AtomicTokenStorage
+
+    token_file = tmp_path / "token.json"
+    token_file.write_text(_oauth_credentials(3600).to_json(), encoding="utf-8")
+    mocker.patch("d2b_data.Google_Token_MNG.build", return_value="service")
+
+    tm = Google_Token_MNG(
+        client_secret="secret.json",
+        token=str(token_file),
+        api_name="searchconsole",
+        api_version="v1",
+        scopes=["scope"],
+    )
+
+    creds = tm.get_cached_credentials("secret.json", str(token_file), ["scope"])
+    assert isinstance(creds.store, _AtomicTokenStorage)
+    assert len(Google_Token_MNG._refreshers) == 1
+
+    Google_Token_MNG.clear_credentials_cache()
+    assert Google_Token_MNG._refreshers == {}
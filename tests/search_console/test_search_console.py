@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
 from googleapiclient.errors import HttpError
 
@@ -340,3 +341,452 @@ def test_get_paginated_report_no_data(gsc, empty_response):
         "position",
     ]
     assert gsc._get_report_raw.call_count == 1
+
+
+def _day_response(query):
+    """Builds a one-row response echoing the queried day."""
+    return {
+        "rows": [
+            {"keys": ["https://example.com/a", query["startDate"]], "clicks": 1,
+             "impressions": 10, "ctr": 0.1, "position": 1.0},
+        ]
+    }
+
+
+def test_set_max_workers_rejects_invalid_values(gsc):
+    """set_max_workers only accepts positive integers."""
+    gsc.set_max_workers(4)
+    assert gsc.max_workers == 4
+
+    with pytest.raises(ValueError):
+        gsc.set_max_workers(0)
+
+
+def test_get_report_df_split_by_day_queries_each_day_in_order(gsc):
+    """split_by_day sends one query per day and keeps the day order."""
+    gsc.auto_paginate = False
+    gsc.split_by_day = True
+    gsc.set_max_workers(3)
+    gsc._get_report_raw = MagicMock(
+        side_effect=lambda property_uri, query: _day_response(query)
+    )
+
+    result = gsc.get_report_df(
+        property_uri="sc-domain:example.com",
+        start_date="2024-01-01",
+        end_date="2024-01-05",
+        dimensions=["page"],
+    )
+
+    queried_days = sorted(
+        call.kwargs["query"]["startDate"]
+        for call in gsc._get_report_raw.call_args_list
+    )
+    assert queried_days == [f"2024-01-0{day}" for day in range(1, 6)]
+    assert list(result["date"]) == [f"2024-01-0{day}" for day in range(1, 6)]
+
+
+def test_get_report_df_search_type_list_adds_column(gsc, raw_response):
+    """A list of search types is fetched per type and tagged in a column."""
+    gsc.auto_paginate = False
+    gsc._get_report_raw = MagicMock(return_value=raw_response)
+
+    result = gsc.get_report_df(
+        property_uri="sc-domain:example.com",
+        start_date="2024-01-01",
+        end_date="2024-01-31",
+        dimensions=["page"],
+        search_type=["web", "image"],
+    )
+
+    types = [call.kwargs["query"]["type"] for call in gsc._get_report_raw.call_args_list]
+    assert types == ["web", "image"]
+    assert list(result["search_type"]) == ["web", "web", "image", "image"]
+
+
+def test_get_report_df_split_by_device_adds_filter_per_device(gsc, raw_response):
+    """split_by_device adds the device dimension and one device filter per slice."""
+    gsc.auto_paginate = False
+    gsc._get_report_raw = MagicMock(return_value={})
+    filter_groups = [
+        {"groupType": "and", "filters": [
+            {"dimension": "country", "operator": "equals", "expression": "esp"},
+        ]},
+    ]
+
+    result = gsc.get_report_df(
+        property_uri="sc-domain:example.com",
+        start_date="2024-01-01",
+        end_date="2024-01-31",
+        dimensions=["page"],
+        dimension_filter_groups=filter_groups,
+        split_by_device=True,
+    )
+
+    queries = [call.kwargs["query"] for call in gsc._get_report_raw.call_args_list]
+    assert [query["dimensionFilterGroups"][0]["filters"][-1]["expression"]
+            for query in queries] == ["DESKTOP", "MOBILE", "TABLET"]
+    assert all(len(query["dimensionFilterGroups"][0]["filters"]) == 2 for query in queries)
+    assert queries[0]["dimensions"] == ["page", "date", "device"]
+    assert len(filter_groups[0]["filters"]) == 1
+    assert result.empty
+    assert "device" in result.columns
+
+
+def test_get_paginated_report_prefetch_keeps_page_order(gsc):
+    """Prefetched pages are concatenated in startRow order up to the short page."""
+    gsc.row_limit = 2
+    gsc.prefetch_pages = 3
+
+    def fake_raw(property_uri, query):
+        start_row = query["startRow"]
+        if start_row > 4:
+            return {}
+        size = 2 if start_row < 4 else 1
+        return {
+            "rows": [
+                {"keys": [f"row-{start_row + offset}", "2024-01-01"], "clicks": 1,
+                 "impressions": 1, "ctr": 1, "position": 1}
+                for offset in range(size)
+            ]
+        }
+
+    gsc._get_report_raw = MagicMock(side_effect=fake_raw)
+
+    result = gsc._get_paginated_report(
+        property_uri="sc-domain:example.com",
+        query=gsc._create_query("2024-01-01", "2024-01-31", ["page", "date"]),
+        dimensions=["page", "date"],
+    )
+
+    assert list(result["page"]) == [f"row-{index}" for index in range(5)]
+    start_rows = {call.kwargs["query"]["startRow"] for call in gsc._get_report_raw.call_args_list}
+    assert {0, 2, 4} <= start_rows
+    assert max(start_rows) <= 2 * (2 + gsc.prefetch_pages)
+
+
+def test_iter_pages_uses_a_pool_per_call_sized_from_prefetch_pages(gsc, mocker):
+    """Every query gets its own prefetch pool, sized from the current prefetch_pages and shut down."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    pools = []
+
+    def make_pool(**kwargs):
+        pool = ThreadPoolExecutor(**kwargs)
+        pool.shutdown = MagicMock(wraps=pool.shutdown)
+        pools.append((kwargs["max_workers"], pool))
+        return pool
+
+    mocker.patch("d2b_data.search_console.ThreadPoolExecutor", side_effect=make_pool)
+    gsc._get_report_raw = MagicMock(return_value={})
+    query = gsc._create_query("2024-01-01", "2024-01-31", ["page", "date"])
+
+    for prefetch_pages in (1, 3):
+        gsc.prefetch_pages = prefetch_pages
+        gsc._get_paginated_report("sc-domain:example.com", query, ["page", "date"])
+
+    assert [max_workers for max_workers, _ in pools] == [2, 4]
+    for _, pool in pools:
+        pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+def test_to_df_uses_categoricals_and_compact_dtypes(gsc, raw_response):
+    """_to_df encodes repetitive dimensions as categoricals with compact metrics."""
+    result = gsc._to_df(raw_response, ["page", "date"])
+
+    assert isinstance(result["page"].dtype, pd.CategoricalDtype)
+    assert not isinstance(result["date"].dtype, pd.CategoricalDtype)
+    assert result["clicks"].dtype == "int32"
+    assert result["impressions"].dtype == "int32"
+    assert result["ctr"].dtype == "float32"
+    assert result["position"].dtype == "float32"
+
+
+def test_get_paginated_report_keeps_categoricals_across_pages(gsc):
+    """Pages with different categories are concatenated as one categorical."""
+    gsc.row_limit = 1
+    pages = [
+        {"rows": [{"keys": [page, "2024-01-01"], "clicks": 1, "impressions": 1,
+                   "ctr": 1, "position": 1}]}
+        for page in ("a", "b")
+    ] + [{}]
+    gsc._get_report_raw = MagicMock(side_effect=pages)
+
+    result = gsc._get_paginated_report(
+        property_uri="sc-domain:example.com",
+        query=gsc._create_query("2024-01-01", "2024-01-31", ["page", "date"]),
+        dimensions=["page", "date"],
+    )
+
+    assert isinstance(result["page"].dtype, pd.CategoricalDtype)
+    assert list(result["page"]) == ["a", "b"]
+
+
+def test_get_report_df_serves_final_days_from_cache(gsc, tmp_path):
+    """With response_cache, final days are fetched once and then read from disk."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.auto_paginate = False
+    gsc.response_cache = DiskCache(str(tmp_path))
+    gsc._get_report_raw = MagicMock(
+        side_effect=lambda property_uri, query: _day_response(query)
+    )
+
+    def run():
+        return gsc.get_report_df(
+            property_uri="sc-domain:example.com",
+            start_date="2024-01-01",
+            end_date="2024-01-03",
+            dimensions=["page"],
+        )
+
+    first = run()
+    second = run()
+
+    assert gsc._get_report_raw.call_count == 3
+    assert list(second["date"]) == list(first["date"])
+    assert list(second["clicks"]) == [1, 1, 1]
+
+
+def test_get_report_df_refetches_fresh_days(gsc, tmp_path):
+    """Days at or after metadata.firstIncompleteDate are never cached."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.auto_paginate = False
+    gsc.response_cache = DiskCache(str(tmp_path))
+
+    def fake_raw(property_uri, query):
+        response = _day_response(query)
+        response["metadata"] = {"firstIncompleteDate": "2024-01-02"}
+        return response
+
+    gsc._get_report_raw = MagicMock(side_effect=fake_raw)
+
+    for _ in range(2):
+        gsc.get_report_df(
+            property_uri="sc-domain:example.com",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            dimensions=["page"],
+            data_state="all",
+        )
+
+    queried_days = [call.kwargs["query"]["startDate"] for call in gsc._get_report_raw.call_args_list]
+    assert sorted(queried_days) == ["2024-01-01", "2024-01-02", "2024-01-02"]
+
+
+def test_get_report_df_never_caches_empty_days(gsc, tmp_path):
+    """A day that came back without rows is requested again on the next run."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.auto_paginate = False
+    gsc.response_cache = DiskCache(str(tmp_path))
+    gsc._get_report_raw = MagicMock(return_value={"rows": []})
+
+    for _ in range(2):
+        gsc.get_report_df(
+            property_uri="sc-domain:example.com",
+            start_date="2024-01-01",
+            end_date="2024-01-01",
+            dimensions=["page"],
+        )
+
+    assert gsc._get_report_raw.call_count == 2
+
+
+def test_cache_key_depends_on_pagination_mode(gsc, tmp_path):
+    """A first-page-only day is never served to a paginated call."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.response_cache = DiskCache(str(tmp_path))
+    query = gsc._create_query("2024-01-01", "2024-01-01", ["page"])
+
+    gsc.auto_paginate = True
+    paginated_key = gsc._cache_key("sc-domain:example.com", query)
+    gsc.auto_paginate = False
+    first_page_key = gsc._cache_key("sc-domain:example.com", query)
+
+    assert paginated_key != first_page_key
+    assert first_page_key != gsc._cache_key("sc-domain:example.com", dict(query, rowLimit=10))
+
+
+def test_is_final_day_uses_pacific_mutable_window(gsc):
+    """The last cache_mutable_days Pacific days are never final."""
+    from datetime import datetime, timedelta
+    from zoneinfo import ZoneInfo
+
+    today = datetime.now(ZoneInfo(gsc.HOURLY_TIMEZONE)).date()
+    recent = (today - timedelta(days=gsc.cache_mutable_days - 1)).isoformat()
+    old = (today - timedelta(days=gsc.cache_mutable_days)).isoformat()
+
+    assert gsc.cache_mutable_days == 5
+    assert not gsc._is_final_day(recent, None)
+    assert gsc._is_final_day(old, None)
+    assert not gsc._is_final_day(old, {"firstIncompleteDate": old})
+
+
+def test_get_report_df_ignores_cached_days_that_are_not_final(gsc, tmp_path):
+    """Entries cached under a shorter mutable window are requested again."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.auto_paginate = False
+    gsc.response_cache = DiskCache(str(tmp_path))
+    gsc._get_report_raw = MagicMock(
+        side_effect=lambda property_uri, query: _day_response(query)
+    )
+
+    def run():
+        gsc.get_report_df(
+            property_uri="sc-domain:example.com",
+            start_date="2024-01-01",
+            end_date="2024-01-01",
+            dimensions=["page"],
+        )
+
+    run()
+    gsc.cache_mutable_days = 100000
+    run()
+
+    assert gsc._get_report_raw.call_count == 2
+
+
+def test_cache_key_depends_on_query_and_day(gsc, tmp_path):
+    """The cache key changes with the filters or the day, not with the pagination."""
+    from d2b_data.disk_cache import DiskCache
+
+    gsc.response_cache = DiskCache(str(tmp_path))
+    query = gsc._create_query("2024-01-01", "2024-01-01", ["page", "date"])
+    filtered = gsc._create_query(
+        "2024-01-01", "2024-01-01", ["page", "date"],
+        dimension_filter_groups=[{"filters": [{"dimension": "country", "expression": "esp"}]}],
+    )
+    other_day = gsc._create_query("2024-01-02", "2024-01-02", ["page", "date"])
+
+    key = gsc._cache_key("sc-domain:example.com", query)
+    assert key == gsc._cache_key("sc-domain:example.com", dict(query, startRow=100))
+    assert key != gsc._cache_key("sc-domain:example.com", filtered)
+    assert key != gsc._cache_key("sc-domain:example.com", other_day)
+    assert gsc._cache_key(
+        "sc-domain:example.com",
+        gsc._create_query("2024-01-01", "2024-01-02", ["page", "date"]),
+    ) is None
+
+
+def _hourly_response(hours, first_incomplete_hour):
+    """Builds an hourly_all response with one row per hour."""
+    return {
+        "rows": [
+            {"keys": ["https://example.com/a", hour], "clicks": 1, "impressions": 1,
+             "ctr": 1, "position": 1}
+            for hour in hours
+        ],
+        "metadata": {"firstIncompleteHour": first_incomplete_hour},
+    }
+
+
+def test_get_hourly_delta_returns_only_new_hours(gsc, tmp_path):
+    """get_hourly_delta emits the hours after the last complete one emitted."""
+    gsc.auto_paginate = False
+    gsc._get_report_raw = MagicMock(side_effect=[
+        _hourly_response(
+            ["2024-01-01T10:00:00-08:00", "2024-01-01T11:00:00-08:00"],
+            "2024-01-01T11:00:00-08:00",
+        ),
+        _hourly_response(
+            ["2024-01-01T10:00:00-08:00", "2024-01-01T11:00:00-08:00",
+             "2024-01-01T12:00:00-08:00"],
+            "2024-01-01T13:00:00-08:00",
+        ),
+    ])
+    state_file = str(tmp_path / "gsc_hourly.json")
+
+    first = gsc.get_hourly_delta("sc-domain:example.com", ["page"], state_file=state_file)
+    second = gsc.get_hourly_delta("sc-domain:example.com", ["page"], state_file=state_file)
+
+    assert len(first) == 2
+    # 11:00 was incomplete on the first call, so it is emitted again.
+    assert list(second["hour"]) == ["2024-01-01T11:00:00-08:00", "2024-01-01T12:00:00-08:00"]
+
+    query = gsc._get_report_raw.call_args_list[-1].kwargs["query"]
+    assert query["dataState"] == "hourly_all"
+    assert query["dimensions"] == ["page", "hour"]
+    assert query["startDate"] == "2024-01-01"
+    assert gsc.service is gsc._get_thread_service()
+
+
+def test_get_report_df_many_tags_properties_and_reports_status(gsc, raw_response, mocker):
+    """get_report_df_many tags rows, retries throttled properties and isolates failures."""
+    mocker.patch("time.sleep")
+    throttled = MagicMock()
+    throttled.status = 429
+    forbidden = MagicMock()
+    forbidden.status = 403
+    throttled_once = {"sc-domain:b.com": True}
+
+    def fake_report(property_uri, **kwargs):
+        if property_uri == "sc-domain:c.com":
+            raise HttpError(resp=forbidden, content=b"Forbidden")
+        if throttled_once.pop(property_uri, False):
+            raise HttpError(resp=throttled, content=b"Too Many Requests")
+        return gsc._to_df(raw_response, ["page", "date"])
+
+    gsc.get_report_df = MagicMock(side_effect=fake_report)
+
+    result, status = gsc.get_report_df_many(
+        ["sc-domain:a.com", "sc-domain:b.com", "sc-domain:c.com"],
+        start_date="2024-01-01",
+        end_date="2024-01-31",
+        dimensions=["page"],
+        max_concurrent_requests=2,
+    )
+
+    assert list(result["property_uri"]) == ["sc-domain:a.com"] * 2 + ["sc-domain:b.com"] * 2
+    assert status["sc-domain:a.com"] == {"status": "ok", "rows": 2, "attempts": 1}
+    assert status["sc-domain:b.com"] == {"status": "ok", "rows": 2, "attempts": 2}
+    assert status["sc-domain:c.com"]["status"] == "error"
+    assert status["sc-domain:c.com"]["attempts"] == 1
+
+
+def test_get_report_df_many_caps_prefetched_pages_per_call(gsc):
+    """max_concurrent_requests reaches prefetched pages and does not outlive the call."""
+    import threading
+    import time
+
+    from d2b_data.search_console import _request_slots
+
+    gsc.row_limit = 1
+    gsc.prefetch_pages = 3
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def fake_query(siteUrl, body):
+        def execute():
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+            if body["startRow"] >= 3:
+                return {}
+            return {"rows": [{"keys": [f"row-{body['startRow']}", "2024-01-01"],
+                              "clicks": 1, "impressions": 1, "ctr": 1, "position": 1}]}
+
+        return MagicMock(execute=execute)
+
+    service = MagicMock()
+    service.searchanalytics.return_value.query.side_effect = fake_query
+    gsc._get_thread_service = MagicMock(return_value=service)
+
+    result, status = gsc.get_report_df_many(
+        ["sc-domain:a.com", "sc-domain:b.com"],
+        start_date="2024-01-01",
+        end_date="2024-01-01",
+        dimensions=["page"],
+        max_property_workers=2,
+        max_concurrent_requests=1,
+    )
+
+    assert len(result) == 6
+    assert in_flight["max"] == 1
+    assert _request_slots.get() is None